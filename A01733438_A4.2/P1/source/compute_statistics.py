@@ -3,8 +3,13 @@ Programa para calcular estadísticas descriptivas (Media, Mediana, Moda, SD, Var
 Cumple con PEP-8 y manejo de errores.
 """
 
+import os
 import sys
-import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", ".."))
+# pylint: disable=wrong-import-position
+from common.instrumentation import Metrics  # noqa: E402
 
 
 def compute_statistics(numbers):
@@ -46,50 +51,69 @@ def compute_statistics(numbers):
     return mean, median, mode, variance, std_dev
 
 
+def read_numbers(filename):
+    """Lee un número por renglón; retorna (números, renglones rechazados)."""
+    numbers = []
+    rejected = 0
+    with open(filename, 'r', encoding='utf-8') as file:
+        for line in file:
+            try:
+                val = float(line.strip())
+                numbers.append(val)
+            except ValueError:
+                rejected += 1
+                print(f"Error: Dato inválido detectado y omitido: {line.strip()}")
+    return numbers, rejected
+
+
+def format_results(filename, results, elapsed_time):
+    """Arma el texto de resultados que se imprime y se guarda."""
+    mean, median, mode, variance, std_dev = results
+    return (
+        f"--- Estadísticas: {filename} ---\n"
+        f"Media: {mean}\n"
+        f"Mediana: {median}\n"
+        f"Moda: {mode}\n"
+        f"Varianza: {variance}\n"
+        f"Desviación Estándar: {std_dev}\n"
+        f"Tiempo de ejecución: {elapsed_time:.6f} segundos\n"
+    )
+
+
 def main():
     """Función principal para manejar archivos y flujo de ejecución."""
-    start_time = time.time()
-    if len(sys.argv) < 2:
-        print("Uso: python computeStatistics.py fileWithData.txt")
+    args = sys.argv[1:]
+    metrics = Metrics.from_args("compute_statistics", args)
+    if len(args) < 1:
+        print("Uso: python computeStatistics.py fileWithData.txt [--profile]")
         return
 
-    filename = sys.argv[1]
-    numbers = []
-
+    filename = args[0]
     try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
-                try:
-                    val = float(line.strip())
-                    numbers.append(val)
-                except ValueError:
-                    print(f"Error: Dato inválido detectado y omitido: {line.strip()}")
+        with metrics.phase("parse"):
+            numbers, rejected = read_numbers(filename)
     except FileNotFoundError:
         print(f"Error: El archivo '{filename}' no existe.")
         return
+    metrics.count_bytes(filename)
+    metrics.count("rows_parsed", len(numbers) + rejected)
+    metrics.count("rows_rejected", rejected)
 
-    results = compute_statistics(numbers)
+    with metrics.phase("compute"):
+        results = compute_statistics(numbers)
     if results:
-        mean, median, mode, variance, std_dev = results
-        elapsed_time = time.time() - start_time
-
-        output = (
-            f"--- Estadísticas: {filename} ---\n"
-            f"Media: {mean}\n"
-            f"Mediana: {median}\n"
-            f"Moda: {mode}\n"
-            f"Varianza: {variance}\n"
-            f"Desviación Estándar: {std_dev}\n"
-            f"Tiempo de ejecución: {elapsed_time:.6f} segundos\n"
-        )
-
-        # Imprimir en pantalla
-        print(output)
-
-        # Guardar en archivo
-        with open("StatisticsResults.txt", 'a', encoding='utf-8') as f_out:
-            f_out.write(output + "\n")
+        elapsed_time = metrics.elapsed()
+
+        with metrics.phase("output"):
+            output = format_results(filename, results, elapsed_time)
+
+            # Imprimir en pantalla
+            print(output)
 
+            # Guardar en archivo
+            with open("StatisticsResults.txt", 'a', encoding='utf-8') as f_out:
+                f_out.write(output + "\n")
+    metrics.write("StatisticsResults.txt")
 
 if __name__ == "__main__":
     main()
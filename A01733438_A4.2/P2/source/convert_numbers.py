@@ -3,8 +3,16 @@ Programa para convertir números a binario y hexadecimal.
 Cumple con PEP-8 y manejo de errores.
 """
 
+import os
 import sys
-import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", ".."))
+# pylint: disable=wrong-import-position
+from common.instrumentation import Metrics  # noqa: E402
+from common.report_writer import (  # noqa: E402
+    ReportWriter, pop_console_options
+)
 
 
 def to_binary(n):
@@ -34,50 +42,60 @@ def to_hexadecimal(n):
     return "-" + hex_res if is_negative else hex_res
 
 
-def process_file(filename):
-    """Lee el archivo y retorna una lista con las conversiones."""
+def process_file(filename, metrics=None):
+    """
+    Lee el archivo y retorna una lista con las conversiones. Si se pasa
+    ``metrics`` se registran los renglones leídos, rechazados y los bytes.
+    """
     data = []
+    rows = rejected = 0
     try:
         with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
+            for rows, line in enumerate(file, 1):
                 val = line.strip()
                 if val:
                     try:
                         num = int(float(val))
                         data.append((num, to_binary(num), to_hexadecimal(num)))
                     except ValueError:
+                        rejected += 1
                         print(f"Error: Dato inválido omitido: {val}")
     except FileNotFoundError:
         print(f"Error: El archivo '{filename}' no existe.")
         return None
+    if metrics is not None:
+        metrics.count_bytes(filename)
+        metrics.count("rows_parsed", rows)
+        metrics.count("rows_rejected", rejected)
     return data
 
 
 def main():
     """Función principal."""
-    start_time = time.time()
-    if len(sys.argv) < 2:
-        print("Uso: python convertNumbers.py fileWithData.txt")
+    args = sys.argv[1:]
+    metrics = Metrics.from_args("convert_numbers", args)
+    quiet, head = pop_console_options(args)
+    if len(args) < 1:
+        print("Uso: python convertNumbers.py fileWithData.txt "
+              "[--profile] [--quiet | --head N]")
         return
 
-    results = process_file(sys.argv[1])
+    with metrics.phase("parse_convert"):
+        results = process_file(args[0], metrics)
     if results is None:
         return
 
-    elapsed_time = time.time() - start_time
-    header = f"{'ITEM':<6} {'NUMBER':<10} {'BINARY':<18} {'HEX':<12}"
-    output = [header, "-" * 50]
-
-    for i, res in enumerate(results, 1):
-        output.append(f"{i:<6} {res[0]:<10} {res[1]:<18} {res[2]:<12}")
-
-    output.append(f"\nExecution Time: {elapsed_time:.6f} seconds")
-    final_text = "\n".join(output)
-
-    print(final_text)
-    with open("ConvertionResults.txt", 'w', encoding='utf-8') as f_out:
-        f_out.write(final_text)
-        f_out.write("\n")  # Asegura el salto de línea final en el txt
+    elapsed_time = metrics.elapsed()
+    with metrics.phase("output"), ReportWriter(
+            "ConvertionResults.txt", quiet, head) as report:
+        report.line(f"{'ITEM':<6} {'NUMBER':<10} {'BINARY':<18} {'HEX':<12}")
+        report.line("-" * 50)
+        report.rows("{0:<6} {1:<10} {2:<18} {3:<12}",
+                    ((i, *res) for i, res in enumerate(results, 1)))
+        report.line()
+        report.line(f"Execution Time: {elapsed_time:.6f} seconds")
+    metrics.count("bytes_written", report.bytes_written)
+    metrics.write("ConvertionResults.txt")
 
 
 if __name__ == "__main__":
@@ -3,21 +3,41 @@ Programa para contar la frecuencia de palabras en un archivo de texto.
 Cumple con PEP-8 y manejo de errores.
 """
 
+import collections
+import itertools
+import os
+import re
 import sys
-import time
+import unicodedata
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "..", ".."))
+# pylint: disable=wrong-import-position
+from common.instrumentation import Metrics  # noqa: E402
+from common.report_writer import (  # noqa: E402
+    ReportWriter, pop_console_options
+)
 
-def load_words(filename):
-    """Lee el archivo y extrae todas las palabras."""
+
+def load_words(filename, metrics=None):
+    """
+    Lee el archivo y extrae todas las palabras. Si se pasa ``metrics`` se
+    registran los renglones, las palabras y los bytes leídos.
+    """
     words = []
+    lines = 0
     try:
         with open(filename, 'r', encoding='utf-8') as file:
-            for line in file:
+            for lines, line in enumerate(file, 1):
                 # Separar por espacios según el Req 1
                 words.extend(line.split())
     except FileNotFoundError:
         print(f"Error: El archivo '{filename}' no fue encontrado.")
         return None
+    if metrics is not None:
+        metrics.count_bytes(filename)
+        metrics.count("rows_parsed", lines)
+        metrics.count("words", len(words))
     return words
 
 
@@ -32,38 +52,227 @@ def compute_frequencies(word_list):
     return freq_map
 
 
+# El apóstrofo y el guion se conservan solo entre dos letras ("don't",
+# "e-mail"); en los bordes o repetidos ("--") se quitan. La expresión
+# empieza con la clase de caracteres para que ``re`` pueda saltar
+# directamente a los candidatos en lugar de probar cada posición.
+_WORD_JOINERS = "'-"
+_EDGE_JOINERS = re.compile(r"['-](?:(?<!\w['-])|(?!\w))")
+
+
+class _PunctuationTable(dict):
+    """
+    Tabla de ``str.translate``: puntuación y símbolos -> espacio. Cada
+    carácter se clasifica la primera vez que aparece, así que cubre todo
+    Unicode (emoji incluidos) sin recorrer los planos por adelantado.
+    """
+
+    def __missing__(self, code):
+        """Clasifica ``code`` y guarda el resultado."""
+        char = chr(code)
+        if char == "\u2019":  # Apóstrofo tipográfico
+            self[code] = "'"
+        elif (unicodedata.category(char)[0] in "PS"
+              and char not in _WORD_JOINERS):
+            self[code] = " "
+        else:
+            self[code] = code
+        return self[code]
+
+
+_PUNCTUATION = _PunctuationTable()
+
+
+def punctuation_table():
+    """Tabla compartida de ``str.translate`` para quitar puntuación."""
+    return _PUNCTUATION
+
+
+def nfkc(text):
+    """Normalización Unicode NFKC (p. ej. "ﬁ" -> "fi", "Ａ" -> "A")."""
+    return unicodedata.normalize("NFKC", text)
+
+
+def casefold(text):
+    """Plegado de mayúsculas y minúsculas ("Straße" -> "strasse")."""
+    return text.casefold()
+
+
+def strip_punctuation(text):
+    """Reemplaza la puntuación por espacios."""
+    text = text.translate(punctuation_table())
+    if "'" in text or "-" in text:
+        text = _EDGE_JOINERS.sub(" ", text)
+    return text
+
+
+class Tokenizer:
+    """
+    Tubería de normalización configurable para el conteo de palabras.
+
+    Cada paso es una función ``str -> str`` que se aplica a un bloque de
+    texto completo (no palabra por palabra). Luego el bloque se separa por
+    espacios, se descartan las palabras vacías (stop words) y, si
+    ``ngram > 1``, se cuentan n-gramas en lugar de palabras.
+    """
+
+    BUFFER_CHARS = 1 << 20
+    DEFAULT_STEPS = (nfkc, casefold, strip_punctuation)
+
+    def __init__(self, steps=(), stop_words=(), ngram=1):
+        """Crea la tubería; las stop words pasan por los mismos pasos."""
+        if ngram < 1:
+            raise ValueError("El tamaño de n-grama debe ser al menos 1.")
+        self.steps = tuple(steps)
+        self.ngram = ngram
+        self.stop_words = frozenset(self.normalize(" ".join(stop_words))
+                                    .split())
+
+    def normalize(self, text):
+        """Aplica todos los pasos al texto."""
+        for step in self.steps:
+            text = step(text)
+        return text
+
+    def tokens(self, text):
+        """Palabras normalizadas del texto, sin stop words."""
+        words = self.normalize(text).split()
+        if self.stop_words:
+            words = list(itertools.filterfalse(self.stop_words.__contains__,
+                                               words))
+        return words
+
+    def buffers(self, file):
+        """Lee ``file`` en bloques que terminan en un salto de línea."""
+        carry = ""
+        while True:
+            chunk = file.read(self.BUFFER_CHARS)
+            if not chunk:
+                break
+            chunk = carry + chunk
+            cut = chunk.rfind("\n")
+            if cut < 0:
+                cut = chunk.rfind(" ")
+            if cut < 0:
+                carry = chunk
+                continue
+            carry = chunk[cut + 1:]
+            yield chunk[:cut + 1]
+        if carry:
+            yield carry
+
+    def count(self, filename, metrics=None):
+        """
+        Cuenta palabras (o n-gramas) del archivo. Retorna un diccionario
+        de frecuencias o None si el archivo no existe.
+        """
+        counts = collections.Counter()
+        tail = []
+        total = lines = 0
+        last = ""
+        try:
+            with open(filename, 'r', encoding='utf-8') as file:
+                for buffer in self.buffers(file):
+                    lines += buffer.count("\n")
+                    last = buffer[-1]
+                    words = self.tokens(buffer)
+                    total += len(words)
+                    if self.ngram == 1:
+                        counts.update(words)
+                        continue
+                    # Los n-gramas continúan entre bloques
+                    words = tail + words
+                    tail = words[-(self.ngram - 1):]
+                    counts.update(map(" ".join, zip(
+                        *(words[i:] for i in range(self.ngram)))))
+        except FileNotFoundError:
+            print(f"Error: El archivo '{filename}' no fue encontrado.")
+            return None
+        if metrics is not None:
+            metrics.count_bytes(filename)
+            # El último renglón puede no terminar en salto de línea
+            metrics.count("rows_parsed", lines + (last not in ("", "\n")))
+            metrics.count("words", total)
+        return counts
+
+
+def build_tokenizer(args):
+    """
+    Quita de ``args`` las opciones ``--normalize``, ``--stopwords archivo``
+    y ``--ngrams N``. Retorna el Tokenizer pedido o None si no hay
+    ninguna; lanza ValueError u OSError si una opción es inválida.
+    """
+    normalize = "--normalize" in args
+    if normalize:
+        args.remove("--normalize")
+    options = {}
+    for flag in ("--stopwords", "--ngrams"):
+        if flag in args:
+            position = args.index(flag)
+            if position + 1 >= len(args):
+                raise ValueError(f"{flag} requiere un valor.")
+            options[flag] = args[position + 1]
+            del args[position:position + 2]
+    if not normalize and not options:
+        return None
+    stop_words = ()
+    if "--stopwords" in options:
+        with open(options["--stopwords"], 'r', encoding='utf-8') as file:
+            stop_words = file.read().split()
+    ngram = options.get("--ngrams", "1")
+    if not ngram.isdigit():
+        raise ValueError("--ngrams requiere un entero.")
+    return Tokenizer(Tokenizer.DEFAULT_STEPS if normalize else (),
+                     stop_words, int(ngram))
+
+
 def main():
     """Función principal para el conteo de palabras."""
-    start_time = time.time()
-    if len(sys.argv) < 2:
-        print("Uso: python wordCount.py fileWithData.txt")
+    args = sys.argv[1:]
+    metrics = Metrics.from_args("word_count", args)
+    quiet, head = pop_console_options(args)
+    try:
+        tokenizer = build_tokenizer(args)
+    except (OSError, ValueError) as error:
+        print(f"Error: {error}")
         return
-
-    all_words = load_words(sys.argv[1])
-    if all_words is None:
+    if len(args) < 1:
+        print("Uso: python wordCount.py fileWithData.txt "
+              "[--normalize] [--stopwords archivo] [--ngrams N] "
+              "[--profile] [--quiet | --head N]")
         return
 
-    frequencies = compute_frequencies(all_words)
-    elapsed_time = time.time() - start_time
+    if tokenizer is None:
+        with metrics.phase("load_words"):
+            all_words = load_words(args[0], metrics)
+        if all_words is None:
+            return
 
-    # Preparación de la salida
-    header = f"{'Word':<20} {'Frequency':<10}"
-    results = [header, "-" * 31]
+        with metrics.phase("compute_frequencies"):
+            frequencies = compute_frequencies(all_words)
+    else:
+        with metrics.phase("tokenize_count"):
+            frequencies = tokenizer.count(args[0], metrics)
+        if frequencies is None:
+            return
+    metrics.count("distinct_words", len(frequencies))
+    elapsed_time = metrics.elapsed()
 
     # Ordenar por frecuencia descendente
-    sorted_items = sorted(frequencies.items(), key=lambda x: x[1], reverse=True)
-
-    for word, count in sorted_items:
-        results.append(f"{word:<20} {count:<10}")
-
-    results.append(f"\nExecution Time: {elapsed_time:.6f} seconds")
-    final_text = "\n".join(results)
+    with metrics.phase("sort"):
+        sorted_items = sorted(frequencies.items(), key=lambda x: x[1],
+                              reverse=True)
 
-    # Requerimiento 2: Pantalla y Archivo
-    print(final_text)
-    with open("WordCountResults.txt", 'w', encoding='utf-8') as f_out:
-        f_out.write(final_text)
-        f_out.write("\n")
+    # Requerimiento 2: Pantalla y Archivo (en flujo, sin armar el reporte)
+    with metrics.phase("output"), ReportWriter(
+            "WordCountResults.txt", quiet, head) as report:
+        report.line(f"{'Word':<20} {'Frequency':<10}")
+        report.line("-" * 31)
+        report.rows("{0:<20} {1:<10}", sorted_items)
+        report.line()
+        report.line(f"Execution Time: {elapsed_time:.6f} seconds")
+    metrics.count("bytes_written", report.bytes_written)
+    metrics.write("WordCountResults.txt")
 
 
 if __name__ == "__main__":
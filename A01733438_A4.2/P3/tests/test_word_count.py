@@ -0,0 +1,161 @@
+"""
+Pruebas unitarias para la tubería de normalización de word_count.py.
+
+Cubre los pasos de Tokenizer (NFKC, casefold, puntuación y apóstrofos o
+guiones entre letras), las stop words, los n-gramas entre bloques y las
+opciones de línea de comandos de build_tokenizer.
+"""
+
+import collections
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                "..", "source"))
+# pylint: disable=wrong-import-position
+from word_count import (  # noqa: E402
+    Metrics, Tokenizer, build_tokenizer, load_words, main
+)
+
+
+def normalized(text, **options):
+    """Palabras de ``text`` con los pasos por defecto."""
+    return Tokenizer(Tokenizer.DEFAULT_STEPS, **options).tokens(text)
+
+
+class TestTokenizer(unittest.TestCase):
+    """Pruebas de los pasos de normalización."""
+
+    def test_joiners_inside_words(self):
+        """El apóstrofo y el guion solo se conservan entre letras."""
+        self.assertEqual(normalized("don't e-mail --x-- 'quoted' a--b"),
+                         ["don't", "e-mail", "x", "quoted", "a", "b"])
+
+    def test_typographic_apostrophe(self):
+        """El apóstrofo tipográfico se trata como apóstrofo."""
+        self.assertEqual(normalized("Don’t"), ["don't"])
+
+    def test_nfkc_and_casefold(self):
+        """Ligaduras, ancho completo y mayúsculas se pliegan."""
+        self.assertEqual(normalized("ﬁne Ａ Straße"),
+                         ["fine", "a", "strasse"])
+
+    def test_symbols_outside_bmp(self):
+        """Los emoji (fuera del plano básico) se tratan como puntuación."""
+        self.assertEqual(normalized("hello\U0001F600 ¡hola!"),
+                         ["hello", "hola"])
+
+    def test_stop_words_are_normalized(self):
+        """Las stop words pasan por los mismos pasos que el texto."""
+        self.assertEqual(normalized("The cat THE end", stop_words=["the"]),
+                         ["cat", "end"])
+
+    def test_rejects_ngram_below_one(self):
+        """Un n-grama menor que 1 es inválido."""
+        with self.assertRaises(ValueError):
+            Tokenizer(ngram=0)
+
+
+class TestTokenizerCount(unittest.TestCase):
+    """Pruebas del conteo por bloques desde archivo."""
+
+    def setUp(self):
+        """Escribe un archivo con varias líneas."""
+        handle, self.filename = tempfile.mkstemp(suffix=".txt")
+        with os.fdopen(handle, 'w', encoding='utf-8') as file:
+            file.write("uno dos tres\ncuatro uno dos\ntres cuatro\n" * 5)
+
+    def tearDown(self):
+        """Elimina el archivo temporal."""
+        os.remove(self.filename)
+
+    def test_ngrams_across_buffers(self):
+        """Los n-gramas no se cortan entre bloques."""
+        expected = Tokenizer(ngram=2).count(self.filename)
+        with mock.patch.object(Tokenizer, "BUFFER_CHARS", 8):
+            self.assertEqual(Tokenizer(ngram=2).count(self.filename),
+                             expected)
+        words = "uno dos tres cuatro uno dos tres cuatro".split() * 5
+        self.assertEqual(expected, collections.Counter(
+            " ".join(pair) for pair in zip(words, words[1:])))
+
+    def test_rows_parsed_matches_load_words(self):
+        """Ambas rutas cuentan los renglones leídos, aun sin salto final."""
+        with open(self.filename, 'a', encoding='utf-8') as file:
+            file.write("\nsin salto final")
+        expected = Metrics("word_count")
+        load_words(self.filename, expected)
+        for buffer_chars in (8, Tokenizer.BUFFER_CHARS):
+            metrics = Metrics("word_count")
+            with self.subTest(buffer_chars=buffer_chars), \
+                    mock.patch.object(Tokenizer, "BUFFER_CHARS",
+                                      buffer_chars):
+                Tokenizer().count(self.filename, metrics)
+                self.assertEqual(metrics.counters["rows_parsed"], 17)
+                self.assertEqual(metrics.counters,
+                                 expected.counters)
+
+    def test_missing_file(self):
+        """Un archivo inexistente retorna None."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(Tokenizer().count("no_existe.txt"))
+
+
+class TestBuildTokenizer(unittest.TestCase):
+    """Pruebas de las opciones de línea de comandos."""
+
+    def test_without_options(self):
+        """Sin opciones no hay tubería y los argumentos no cambian."""
+        args = ["datos.txt", "--quiet"]
+        self.assertIsNone(build_tokenizer(args))
+        self.assertEqual(args, ["datos.txt", "--quiet"])
+
+    def test_options_are_removed(self):
+        """Las opciones reconocidas se quitan de los argumentos."""
+        args = ["--normalize", "datos.txt", "--ngrams", "3"]
+        tokenizer = build_tokenizer(args)
+        self.assertEqual(args, ["datos.txt"])
+        self.assertEqual(tokenizer.ngram, 3)
+        self.assertEqual(tokenizer.steps, Tokenizer.DEFAULT_STEPS)
+
+    def test_ngrams_without_normalize(self):
+        """``--ngrams`` solo no aplica los pasos de normalización."""
+        self.assertEqual(build_tokenizer(["--ngrams", "2"]).steps, ())
+
+    def test_invalid_values(self):
+        """Valores faltantes, no enteros o cero se rechazan."""
+        for args in (["datos.txt", "--ngrams"], ["--ngrams", "dos"],
+                     ["--ngrams", "0"], ["--stopwords"]):
+            with self.subTest(args=args), self.assertRaises(ValueError):
+                build_tokenizer(list(args))
+
+    def test_missing_stopwords_file(self):
+        """Un archivo de stop words inexistente lanza OSError."""
+        with self.assertRaises(OSError):
+            build_tokenizer(["--stopwords", "no_existe.txt"])
+
+    def test_main_reports_invalid_option(self):
+        """main() informa la opción inválida y no escribe resultados."""
+        output = io.StringIO()
+        with tempfile.TemporaryDirectory() as workdir, \
+                mock.patch.object(sys, "argv",
+                                  ["word_count.py", "x.txt", "--ngrams"]):
+            previous_dir = os.getcwd()
+            os.chdir(workdir)
+            try:
+                with contextlib.redirect_stdout(output):
+                    main()
+                self.assertFalse(os.path.exists("WordCountResults.txt"))
+            finally:
+                os.chdir(previous_dir)
+        self.assertEqual(output.getvalue(),
+                         "Error: --ngrams requiere un valor.\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -4,8 +4,26 @@ Cumple con los estándares PEP-8 y manejo de errores.
 """
 
 import json
+import os
+import queue
 import sys
-import time
+import threading
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                ".."))
+# pylint: disable=wrong-import-position
+from common.instrumentation import Metrics  # noqa: E402
+
+
+# Motivos de rechazo reconocidos por RejectSink
+REASON_MISSING_FIELD = "missing_field"
+REASON_UNKNOWN_PRODUCT = "unknown_product"
+REASON_INVALID_QUANTITY = "invalid_quantity"
+REJECT_REASONS = (
+    REASON_MISSING_FIELD,
+    REASON_UNKNOWN_PRODUCT,
+    REASON_INVALID_QUANTITY,
+)
 
 
 def load_json_file(file_path):
@@ -22,22 +40,120 @@ def load_json_file(file_path):
     return None
 
 
-def calculate_total(catalogue, sales):
+class RejectSink:
+    """
+    Acumula los registros inválidos sin imprimir uno por uno.
+
+    Cuenta los rechazos por motivo, conserva una muestra acotada de los
+    primeros registros y, opcionalmente, los escribe en un archivo lateral
+    (JSON Lines) desde un hilo escritor con búfer para no frenar el cálculo.
+    """
+
+    _BATCH_SIZE = 1024
+
+    def __init__(self, sample_size=10, side_file=None):
+        """Inicializa los contadores y, si aplica, el escritor de fondo."""
+        self.counts = dict.fromkeys(REJECT_REASONS, 0)
+        self.sample = []
+        self.sample_size = sample_size
+        self.side_file = side_file
+        self._pending = []
+        self._queue = None
+        self._thread = None
+        if side_file is not None:
+            self._queue = queue.Queue(maxsize=64)
+            self._thread = threading.Thread(
+                target=self._write_loop, args=(side_file,), daemon=True
+            )
+            self._thread.start()
+
+    @property
+    def total(self):
+        """Número total de registros rechazados."""
+        return sum(self.counts.values())
+
+    def reject(self, reason, record):
+        """Registra un rechazo con su motivo."""
+        self.counts[reason] += 1
+        if len(self.sample) < self.sample_size:
+            self.sample.append((reason, record))
+        if self._queue is not None:
+            self._pending.append((reason, record))
+            if len(self._pending) >= self._BATCH_SIZE:
+                self._queue.put(self._pending)
+                self._pending = []
+
+    def close(self):
+        """Vacía los rechazos pendientes y espera al hilo escritor."""
+        if self._queue is None:
+            return
+        if self._pending:
+            self._queue.put(self._pending)
+            self._pending = []
+        self._queue.put(None)
+        self._thread.join()
+        self._queue = None
+
+    def _write_loop(self, side_file):
+        """Escribe los lotes recibidos por la cola en el archivo lateral."""
+        try:
+            with open(side_file, 'w', encoding='utf-8',
+                      buffering=1 << 20) as file:
+                while True:
+                    batch = self._queue.get()
+                    if batch is None:
+                        return
+                    file.write("".join(
+                        json.dumps({"reason": reason, "record": record},
+                                   ensure_ascii=False, default=str) + "\n"
+                        for reason, record in batch
+                    ))
+        except IOError as error:
+            print(f"Error al escribir el archivo de rechazos: {error}")
+            # Drenar la cola para que close() no quede bloqueado
+            while self._queue.get() is not None:
+                pass
+
+    def summary(self):
+        """Genera el resumen de rechazos para el reporte."""
+        lines = [f"Registros inválidos omitidos: {self.total}"]
+        for reason in REJECT_REASONS:
+            lines.append(f"  {reason}: {self.counts[reason]}")
+        for reason, record in self.sample:
+            lines.append(f"  Ejemplo ({reason}): {record}")
+        if self.side_file is not None:
+            lines.append(f"  Detalle en: {self.side_file}")
+        return "\n".join(lines) + "\n"
+
+
+def calculate_total(catalogue, sales, sink=None):
     """
     Calcula el costo total de las ventas usando el catálogo de precios.
+
+    Los registros inválidos se envían a ``sink`` (un RejectSink) en lugar
+    de imprimirse individualmente.
     """
+    if sink is None:
+        sink = RejectSink()
     total_cost = 0.0
     price_map = {item['title']: item['price'] for item in catalogue
                  if 'title' in item and 'price' in item}
 
     for sale in sales:
-        product = sale.get('product')
-        quantity = sale.get('quantity')
-
-        if product in price_map and isinstance(quantity, (int, float)):
-            total_cost += price_map[product] * quantity
+        if (not isinstance(sale, dict) or 'product' not in sale
+                or 'quantity' not in sale):
+            sink.reject(REASON_MISSING_FIELD, sale)
+            continue
+
+        product = sale['product']
+        quantity = sale['quantity']
+
+        if product not in price_map:
+            sink.reject(REASON_UNKNOWN_PRODUCT, sale)
+        elif not isinstance(quantity, (int, float)):
+            sink.reject(REASON_INVALID_QUANTITY, sale)
         else:
-            print(f"Dato inválido omitido: {sale}")
+            total_cost += price_map[product] * quantity
 
     return total_cost
 
@@ -46,40 +162,62 @@ def main():
     """
     Función principal para ejecutar la lógica de cálculo de ventas.
     """
-    start_time = time.time()
-
-    if len(sys.argv) != 3:
+    args = sys.argv[1:]
+    metrics = Metrics.from_args("compute_sales", args)
+    rejects_file = None
+    if "--rejects" in args:
+        position = args.index("--rejects")
+        if position + 1 >= len(args):
+            print("Error: --rejects requiere un valor.")
+            return
+        rejects_file = args[position + 1]
+        del args[position:position + 2]
+
+    if len(args) != 2 or rejects_file == "":
         print("Uso: python computeSales.py "
-              "priceCatalogue.json salesRecord.json")
+              "priceCatalogue.json salesRecord.json [--rejects archivo] "
+              "[--profile]")
         return
 
-    price_file = sys.argv[1]
-    sales_file = sys.argv[2]
+    price_file, sales_file = args
 
-    catalogue_data = load_json_file(price_file)
-    sales_data = load_json_file(sales_file)
+    with metrics.phase("load"):
+        catalogue_data = load_json_file(price_file)
+        sales_data = load_json_file(sales_file)
 
     if catalogue_data is None or sales_data is None:
         return
+    metrics.count_bytes(price_file)
+    metrics.count_bytes(sales_file)
 
-    total_sales = calculate_total(catalogue_data, sales_data)
-    elapsed_time = time.time() - start_time
+    sink = RejectSink(side_file=rejects_file)
+    try:
+        with metrics.phase("compute"):
+            total_sales = calculate_total(catalogue_data, sales_data, sink)
+    finally:
+        sink.close()
+    metrics.count("rows_parsed", len(sales_data))
+    metrics.count("rows_rejected", sink.total)
+    elapsed_time = metrics.elapsed()
 
     # Preparar el resultado
     result_output = (
         "----------- REPORTE DE VENTAS -----------\n"
         f"Costo Total: ${total_sales:,.2f}\n"
+        f"{sink.summary()}"
         f"Tiempo de ejecución: {elapsed_time:.4f} segundos\n"
         "-----------------------------------------\n"
     )
 
     # Imprimir en pantalla y guardar en archivo
-    print(result_output)
-    try:
-        with open("SalesResults.txt", "w", encoding='utf-8') as f_out:
-            f_out.write(result_output)
-    except IOError as error:
-        print(f"Error al escribir el archivo de resultados: {error}")
+    with metrics.phase("output"):
+        print(result_output)
+        try:
+            with open("SalesResults.txt", "w", encoding='utf-8') as f_out:
+                f_out.write(result_output)
+        except IOError as error:
+            print(f"Error al escribir el archivo de resultados: {error}")
+    metrics.write("SalesResults.txt")
 
 
 if __name__ == "__main__":
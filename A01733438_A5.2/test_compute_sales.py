@@ -0,0 +1,93 @@
+"""
+Pruebas unitarias para compute_sales.py.
+
+Cubre el cálculo del total y el registro de rechazos de RejectSink
+(conteo por motivo, muestra acotada y archivo lateral).
+"""
+
+import contextlib
+import io
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+from compute_sales import (
+    REASON_INVALID_QUANTITY, REASON_MISSING_FIELD, REASON_UNKNOWN_PRODUCT,
+    RejectSink, calculate_total, main
+)
+
+
+CATALOGUE = [{"title": "A", "price": 10.0}, {"title": "B", "price": 2.5}]
+
+
+class TestRejectSink(unittest.TestCase):
+    """Pruebas para la acumulación de registros inválidos."""
+
+    def setUp(self):
+        """Define el archivo lateral de las pruebas."""
+        self.side_file = "test_rejects.jsonl"
+
+    def tearDown(self):
+        """Elimina el archivo lateral."""
+        if os.path.exists(self.side_file):
+            os.remove(self.side_file)
+
+    def test_counts_by_reason(self):
+        """Cada motivo de rechazo se cuenta por separado."""
+        sink = RejectSink()
+        total = calculate_total(CATALOGUE, [
+            {"product": "A", "quantity": 2},
+            {"product": "Z", "quantity": 1},
+            {"product": "B", "quantity": "dos"},
+            {"quantity": 1},
+            "no es un registro",
+        ], sink)
+        self.assertEqual(total, 20.0)
+        self.assertEqual(sink.counts[REASON_UNKNOWN_PRODUCT], 1)
+        self.assertEqual(sink.counts[REASON_INVALID_QUANTITY], 1)
+        self.assertEqual(sink.counts[REASON_MISSING_FIELD], 2)
+        self.assertEqual(sink.total, 4)
+
+    def test_sample_is_bounded(self):
+        """La muestra conserva solo los primeros ``sample_size`` rechazos."""
+        sink = RejectSink(sample_size=3)
+        for number in range(50):
+            sink.reject(REASON_UNKNOWN_PRODUCT, {"product": number})
+        self.assertEqual(sink.total, 50)
+        self.assertEqual([record["product"] for _, record in sink.sample],
+                         [0, 1, 2])
+        self.assertEqual(sink.summary().count("Ejemplo"), 3)
+
+    def test_side_file(self):
+        """Todos los rechazos se escriben en el archivo lateral."""
+        sink = RejectSink(sample_size=1, side_file=self.side_file)
+        count = RejectSink._BATCH_SIZE + 5  # pylint: disable=protected-access
+        for number in range(count):
+            sink.reject(REASON_INVALID_QUANTITY, {"quantity": number})
+        sink.close()
+        with open(self.side_file, 'r', encoding='utf-8') as file:
+            rows = [json.loads(line) for line in file]
+        self.assertEqual(len(rows), count)
+        self.assertEqual(rows[-1], {"reason": REASON_INVALID_QUANTITY,
+                                    "record": {"quantity": count - 1}})
+        self.assertIn(f"Detalle en: {self.side_file}", sink.summary())
+
+
+class TestMain(unittest.TestCase):
+    """Pruebas para la interpretación de argumentos."""
+
+    def test_rejects_without_value(self):
+        """``--rejects`` sin archivo es un error de uso."""
+        output = io.StringIO()
+        argv = ["compute_sales.py", "catalogo.json", "ventas.json",
+                "--rejects"]
+        with mock.patch.object(sys, "argv", argv), \
+                contextlib.redirect_stdout(output):
+            main()
+        self.assertIn("--rejects requiere un valor", output.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
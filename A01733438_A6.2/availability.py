@@ -0,0 +1,240 @@
+"""
+Índice de disponibilidad por fechas para el sistema de reservaciones.
+
+Cada hotel tiene un árbol de segmentos disperso sobre los días con las
+habitaciones ocupadas por noche. Reservar o liberar un
+rango suma -1/+1 al rango (propagación perezosa) y consultar si hay cupo es
+un mínimo sobre el rango, ambos en O(log n) sin recorrer las reservaciones.
+"""
+
+from datetime import date
+
+
+def parse_date(value):
+    """
+    Convierte una fecha ISO (``AAAA-MM-DD``) o ``date`` a ``date``. Lanza
+    ValueError si el valor no es una fecha.
+    """
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str):
+        raise ValueError(f"Fecha inválida: {value!r}")
+    return date.fromisoformat(value)
+
+
+class SegmentTree:
+    """
+    Árbol de segmentos disperso con suma en rango y mínimo en rango.
+
+    Las posiciones no tocadas valen cero. El árbol solo crea los nodos que
+    tocan las operaciones (un nodo sin hijos representa un tramo con el
+    mismo valor) y cubre ``low..low+size-1``; si ``add`` cae fuera, crece
+    al doble agregando una raíz, sin copiar valores. Así su profundidad
+    depende del tramo realmente usado y no de dónde empieza.
+    """
+
+    def __init__(self, size=1, low=None):
+        """
+        Crea el árbol con ``size`` posiciones desde ``low``; sin ``low``,
+        el rango empieza en la primera posición que se sume.
+        """
+        self.size = size
+        self.low = low
+        # El nodo 0 es la raíz; _left guarda el índice del hijo izquierdo
+        # (el derecho le sigue) y 0 si el nodo no tiene hijos.
+        self._min = [0]
+        self._lazy = [0]
+        self._left = [0]
+
+    def _grow(self, first, last):
+        """Duplica el rango con una raíz nueva hasta cubrir first..last."""
+        if self.low is None:
+            self.low = first
+        while first < self.low or last >= self.low + self.size:
+            moved = len(self._min)
+            self._min += [0, 0]
+            self._lazy += [0, 0]
+            self._left += [0, 0]
+            # La raíz anterior pasa a ser el hijo que cubre el rango viejo
+            side = moved + 1 if first < self.low else moved
+            self._min[side] = self._min[0]
+            self._lazy[side] = self._lazy[0]
+            self._left[side] = self._left[0]
+            self._min[0] = min(self._min[0], 0)
+            self._lazy[0] = 0
+            self._left[0] = moved
+            if first < self.low:
+                self.low -= self.size
+            self.size *= 2
+
+    def _split(self, node):
+        """Crea los hijos del nodo o les baja la suma pendiente."""
+        left = self._left[node]
+        if not left:
+            left = self._left[node] = len(self._min)
+            self._min += [self._min[node]] * 2
+            self._lazy += [0, 0]
+            self._left += [0, 0]
+        elif self._lazy[node]:
+            for child in (left, left + 1):
+                self._min[child] += self._lazy[node]
+                self._lazy[child] += self._lazy[node]
+        self._lazy[node] = 0
+        return left
+
+    def add(self, first, last, delta):
+        """Suma ``delta`` a las posiciones ``first..last`` (inclusivo)."""
+        self._grow(first, last)
+        self._add(0, self.low, self.low + self.size - 1, (first, last),
+                  delta)
+
+    def _add(self, node, low, high, span, delta):
+        """Suma ``delta`` a la parte de ``span`` dentro de ``low..high``."""
+        if span[1] < low or high < span[0]:
+            return
+        if span[0] <= low and high <= span[1]:
+            self._min[node] += delta
+            self._lazy[node] += delta
+            return
+        left = self._split(node)
+        mid = (low + high) // 2
+        self._add(left, low, mid, span, delta)
+        self._add(left + 1, mid + 1, high, span, delta)
+        self._min[node] = min(self._min[left], self._min[left + 1])
+
+    def minimum(self, first, last):
+        """Mínimo de las posiciones ``first..last`` (inclusivo)."""
+        if self.low is None:
+            return 0
+        high = self.low + self.size - 1
+        result = self._minimum(0, self.low, high, (first, last))
+        if first < self.low or last > high:
+            result = min(result, 0)
+        return result
+
+    def _minimum(self, node, low, high, span):
+        """Mínimo de la parte de ``span`` dentro de ``low..high``."""
+        if span[1] < low or high < span[0]:
+            return float("inf")
+        left = self._left[node]
+        if not left or (span[0] <= low and high <= span[1]):
+            return self._min[node]
+        mid = (low + high) // 2
+        return self._lazy[node] + min(
+            self._minimum(left, low, mid, span),
+            self._minimum(left + 1, mid + 1, high, span))
+
+    def values(self):
+        """Valores de ``low..low+size-1`` (O(size); para árboles pequeños)."""
+        leaves = []
+        self._collect(0, self.low or 0, (self.low or 0) + self.size - 1, 0,
+                      leaves)
+        return leaves
+
+    def _collect(self, node, low, high, pending, leaves):
+        """Agrega a ``leaves`` los valores del nodo sumando lo pendiente."""
+        left = self._left[node]
+        if not left:
+            leaves.extend([self._min[node] + pending] * (high - low + 1))
+            return
+        pending += self._lazy[node]
+        mid = (low + high) // 2
+        self._collect(left, low, mid, pending, leaves)
+        self._collect(left + 1, mid + 1, high, pending, leaves)
+
+
+class HotelInventory:
+    """
+    Habitaciones libres por noche de un hotel.
+
+    El árbol lleva las habitaciones ocupadas por noche (en negativo) por
+    número de día; como es disperso y crece según las fechas usadas,
+    reservar en cualquier fecha cuesta O(log n) con n el tramo entre la
+    primera y la última noche registradas, y ninguna fecha queda fuera.
+    """
+
+    INITIAL_DAYS = 366
+
+    def __init__(self, capacity):
+        """Crea el inventario con ``capacity`` habitaciones por noche."""
+        self.capacity = capacity
+        self._tree = SegmentTree(self.INITIAL_DAYS)
+
+    @staticmethod
+    def _span(check_in, check_out):
+        """Convierte las fechas en posiciones (noches check_in..out-1)."""
+        first = parse_date(check_in).toordinal()
+        last = parse_date(check_out).toordinal() - 1
+        if last < first:
+            raise ValueError("La salida debe ser posterior a la llegada.")
+        return first, last
+
+    def set_capacity(self, capacity):
+        """Ajusta la capacidad conservando las reservas registradas."""
+        self.capacity = capacity
+
+    def free_rooms(self, check_in, check_out):
+        """Habitaciones libres en todas las noches del rango."""
+        first, last = self._span(check_in, check_out)
+        return self.capacity + self._tree.minimum(first, last)
+
+    def book(self, check_in, check_out):
+        """Ocupa una habitación en el rango si hay cupo; retorna el éxito."""
+        first, last = self._span(check_in, check_out)
+        if self.capacity + self._tree.minimum(first, last) < 1:
+            return False
+        self._tree.add(first, last, -1)
+        return True
+
+    def occupy(self, check_in, check_out):
+        """Ocupa una habitación en el rango sin verificar el cupo."""
+        first, last = self._span(check_in, check_out)
+        self._tree.add(first, last, -1)
+
+    def release(self, check_in, check_out):
+        """Libera una habitación en el rango."""
+        first, last = self._span(check_in, check_out)
+        self._tree.add(first, last, 1)
+
+
+def hotel_capacity(hotel):
+    """Habitaciones por noche de un hotel (``rooms_total`` si existe)."""
+    return hotel.get("rooms_total", hotel["rooms_available"])
+
+
+class AvailabilityIndex:
+    """
+    Inventarios por hotel construidos a partir de las reservaciones.
+
+    Cada inventario se arma la primera vez que se consulta el hotel (un
+    recorrido de sus reservaciones con fecha) y luego se mantiene con cada
+    reserva o cancelación.
+    """
+
+    def __init__(self):
+        """Crea un índice vacío."""
+        self._inventories = {}
+
+    def clear(self):
+        """Descarta los inventarios (p. ej. si otro proceso cambió datos)."""
+        self._inventories = {}
+
+    def inventory(self, hotel, reservations):
+        """Retorna el inventario del hotel, construyéndolo si hace falta."""
+        hotel_id = hotel["hotel_id"]
+        inventory = self._inventories.get(hotel_id)
+        if inventory is None:
+            inventory = HotelInventory(hotel_capacity(hotel))
+            for record in reservations:
+                if (record.get("hotel_id") == hotel_id
+                        and record.get("check_in")):
+                    inventory.occupy(record["check_in"],
+                                     record["check_out"])
+            self._inventories[hotel_id] = inventory
+        else:
+            inventory.set_capacity(hotel_capacity(hotel))
+        return inventory
+
+    def forget(self, hotel_id):
+        """Descarta el inventario de un hotel."""
+        self._inventories.pop(hotel_id, None)
@@ -0,0 +1,316 @@
+"""
+Servicio asíncrono de reservaciones sobre TCP.
+
+Protocolo: una línea JSON por solicitud, ``{"id": 1, "op": "book",
+"args": {...}}``, y una línea JSON por respuesta, ``{"id": 1, "ok": true,
+"result": ...}`` o ``{"id": 1, "ok": false, "error": "..."}``.
+
+Las conexiones se atienden con ``asyncio`` y ninguna bloquea el ciclo de
+eventos: todas las operaciones pasan por una cola a una única tarea
+escritora que las ejecuta en orden en un hilo aparte. Las reservas
+consecutivas de la cola se confirman juntas con ``book_many`` (commit en
+grupo: un candado y un fsync para todo el grupo).
+
+La operación ``info`` informa los archivos de datos en uso; el generador
+de carga la consulta para no escribir sobre los archivos por defecto.
+
+Uso: python booking_server.py [puerto] [--data-dir directorio]
+"""
+
+import asyncio
+import json
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+from reservation_system import (
+    BatchResult, Customer, Hotel, Reservation, ReservationService
+)
+
+# Archivos de ReservationService() relativos al directorio de datos
+DATA_FILES = ("hotels.json", "customers.json", "reservations.json")
+
+
+class BookingServer:
+    """Atiende solicitudes JSON sobre TCP con commit en grupo."""
+
+    MAX_GROUP = 512
+
+    def __init__(self, service=None):
+        """Usa ``service`` o un ReservationService con los archivos base."""
+        self.service = service or ReservationService()
+        self.groups_committed = 0
+        self._queue = None
+        self._writer_task = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._server = None
+
+    async def start(self, host="127.0.0.1", port=8765):
+        """Inicia el servidor y la tarea escritora; retorna el puerto."""
+        self._queue = asyncio.Queue()
+        self._writer_task = asyncio.create_task(self._writer_loop())
+        self._server = await asyncio.start_server(self._handle_client,
+                                                  host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        """Detiene el servidor, la tarea escritora y vuelca los cambios."""
+        self._server.close()
+        await self._server.wait_closed()
+        self._writer_task.cancel()
+        try:
+            await self._writer_task
+        except asyncio.CancelledError:
+            pass
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self._executor, self.service.checkpoint)
+        self._executor.shutdown()
+
+    async def serve_forever(self):
+        """Atiende conexiones hasta que se cancele."""
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def _handle_client(self, reader, writer):
+        """Lee solicitudes de una conexión y responde cada una."""
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                writer.write(await self._respond(line))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _respond(self, line):
+        """Procesa una línea de solicitud y retorna la línea de respuesta."""
+        try:
+            request = json.loads(line)
+            request_id = request.get("id")
+            operation = request["op"]
+            args = request.get("args", {})
+            if not isinstance(operation, str) or not isinstance(args, dict):
+                raise TypeError("op o args con tipo inválido")
+        except (ValueError, AttributeError, KeyError, TypeError):
+            return _encode({"id": None, "ok": False,
+                            "error": "Solicitud inválida."})
+        if operation not in OPERATIONS:
+            return _encode({"id": request_id, "ok": False,
+                            "error": f"Operación desconocida: {operation}"})
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, args, future))
+        ok, value = await future
+        response = {"id": request_id, "ok": ok}
+        response["result" if ok else "error"] = value
+        return _encode(response)
+
+    async def _writer_loop(self):
+        """Toma todo lo encolado y lo ejecuta como un grupo."""
+        loop = asyncio.get_running_loop()
+        while True:
+            group = [await self._queue.get()]
+            while not self._queue.empty() and len(group) < self.MAX_GROUP:
+                group.append(self._queue.get_nowait())
+            try:
+                outcomes = await loop.run_in_executor(
+                    self._executor, self._execute_group,
+                    [(operation, args) for operation, args, _ in group])
+            except Exception as error:  # pylint: disable=broad-except
+                # Un fallo del grupo no debe detener la tarea escritora
+                outcomes = [(False, f"Error interno: {error}")] * len(group)
+            for (_, _, future), outcome in zip(group, outcomes):
+                if not future.cancelled():
+                    future.set_result(outcome)
+
+    def _execute_group(self, requests):
+        """
+        Ejecuta un grupo en orden (en el hilo escritor). Las reservas
+        consecutivas se confirman juntas con ``book_many``.
+        """
+        outcomes = []
+        position = 0
+        while position < len(requests):
+            end = position
+            while end < len(requests) and requests[end][0] == "book":
+                end += 1
+            if end > position:
+                outcomes.extend(self._book_group(requests[position:end]))
+                position = end
+                continue
+            operation, args = requests[position]
+            outcomes.append(self._execute(operation, args))
+            position += 1
+        return outcomes
+
+    def _book_group(self, requests):
+        """Confirma un grupo de reservas en una sola transacción."""
+        outcomes = [None] * len(requests)
+        batch, positions = [], []
+        for position, (_, args) in enumerate(requests):
+            try:
+                batch.append(_reservation(args))
+                positions.append(position)
+            except (KeyError, TypeError, ValueError):
+                outcomes[position] = (False, "Argumentos inválidos.")
+        if batch:
+            self.groups_committed += 1
+            try:
+                results = self.service.book_many(batch)
+            except Exception:  # pylint: disable=broad-except
+                # Se reintenta una por una para que solo falle la culpable
+                results = [self._book_one(item) for item in batch]
+            for position, result in zip(positions, results):
+                outcomes[position] = (result.ok, result.error)
+        return outcomes
+
+    def _book_one(self, reservation):
+        """Confirma una reserva sola; un fallo se reporta como error."""
+        try:
+            return self.service.book_many([reservation])[0]
+        except Exception as error:  # pylint: disable=broad-except
+            return BatchResult(reservation.reservation_id, False,
+                               f"Error interno: {error}")
+
+    def _execute(self, operation, args):
+        """Ejecuta una operación que no es reserva; retorna (ok, valor)."""
+        try:
+            return OPERATIONS[operation](self.service, args)
+        except (KeyError, TypeError, ValueError) as error:
+            return False, f"Argumentos inválidos: {error}"
+
+
+def _encode(response):
+    """Serializa una respuesta como línea JSON."""
+    return (json.dumps(response, ensure_ascii=False) + "\n").encode('utf-8')
+
+
+def _reservation(args):
+    """
+    Crea la Reservation de una solicitud. Los IDs deben ser escalares y
+    las fechas cadenas; si no, lanza TypeError.
+    """
+    ids = (args["reservation_id"], args["customer_id"], args["hotel_id"])
+    dates = (args.get("check_in"), args.get("check_out"))
+    if (not all(isinstance(value, (str, int)) for value in ids)
+            or not all(value is None or isinstance(value, str)
+                       for value in dates)):
+        raise TypeError("IDs o fechas con tipo inválido")
+    return Reservation(*ids, *dates)
+
+
+def _found(record, message):
+    """Convierte una búsqueda en (ok, valor)."""
+    return (True, record) if record is not None else (False, message)
+
+
+def _get_hotel(service, args):
+    """Consulta un hotel por ID."""
+    return _found(service.table(Hotel).get(args["hotel_id"]),
+                  "Hotel no encontrado.")
+
+
+def _get_customer(service, args):
+    """Consulta un cliente por ID."""
+    return _found(service.table(Customer).get(args["customer_id"]),
+                  "Cliente no encontrado.")
+
+
+def _create_hotel(service, args):
+    """Crea un hotel."""
+    hotel = Hotel(args["hotel_id"], args["name"], args["location"],
+                  args["rooms_available"])
+    if Hotel.create_hotel(hotel, service.hotels_file):
+        return True, None
+    return False, f"El hotel {hotel.hotel_id} ya existe."
+
+
+def _create_customer(service, args):
+    """Crea un cliente."""
+    customer = Customer(args["customer_id"], args["name"], args["email"])
+    if Customer.create_customer(customer, service.customers_file):
+        return True, None
+    return False, f"El cliente {customer.customer_id} ya existe."
+
+
+def _cancel(service, args):
+    """Cancela una reservación."""
+    if service.cancel(args["reservation_id"]):
+        return True, None
+    return False, "Reservación no encontrada para cancelar."
+
+
+def _free_rooms(service, args):
+    """Habitaciones libres de un hotel en un rango de fechas."""
+    return _found(service.free_rooms(args["hotel_id"], args["check_in"],
+                                     args["check_out"]),
+                  "Hotel o fechas inválidas.")
+
+
+def _info(service, _args):
+    """Archivos de datos del servicio y si son los de por defecto."""
+    files = [service.hotels_file, service.customers_file,
+             service.reservations_file]
+    default = any(os.path.abspath(name) == os.path.abspath(default_name)
+                  for name, default_name in zip(files, DATA_FILES))
+    return True, {"files": files, "default_data": default}
+
+
+def _customer_reservations(service, args):
+    """Reservaciones de un cliente."""
+    return True, Reservation.find_by_customer(args["customer_id"],
+                                              service.reservations_file)
+
+
+OPERATIONS = {
+    "book": None,  # Se atiende en grupo en _book_group
+    "cancel": _cancel,
+    "create_customer": _create_customer,
+    "create_hotel": _create_hotel,
+    "customer_reservations": _customer_reservations,
+    "free_rooms": _free_rooms,
+    "get_customer": _get_customer,
+    "get_hotel": _get_hotel,
+    "info": _info,
+}
+
+
+def data_service(data_dir):
+    """ReservationService sobre los archivos de ``data_dir``."""
+    return ReservationService(*(os.path.join(data_dir, name)
+                                for name in DATA_FILES))
+
+
+def _parse_args(args):
+    """Retorna (puerto, directorio de datos) de la línea de comandos."""
+    data_dir = "."
+    if "--data-dir" in args:
+        position = args.index("--data-dir")
+        if position + 1 >= len(args):
+            raise ValueError("--data-dir requiere un valor.")
+        data_dir = args[position + 1]
+        del args[position:position + 2]
+    return (int(args[0]) if args else 8765), data_dir
+
+
+async def _main(port, data_dir):
+    """Inicia el servidor con los archivos de ``data_dir``."""
+    server = BookingServer(data_service(data_dir))
+    port = await server.start(port=port)
+    print(f"Servicio de reservaciones escuchando en 127.0.0.1:{port} "
+          f"(datos en {os.path.abspath(data_dir)})")
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main(*_parse_args(sys.argv[1:])))
+    except ValueError as error:
+        print(f"Error: {error}")
+    except KeyboardInterrupt:
+        print("Servicio detenido.")
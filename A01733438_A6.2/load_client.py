@@ -0,0 +1,131 @@
+"""
+Generador de carga para booking_server.py.
+
+Abre varias conexiones concurrentes contra el servicio, registra un hotel y
+un cliente de prueba y envía reservas sin fecha, midiendo reservas por
+segundo y la latencia (p50/p99) de cada solicitud.
+
+Como la carga deja hoteles, clientes y reservaciones de prueba, se niega a
+correr si el servicio usa los archivos de datos por defecto: inicie el
+servicio con ``--data-dir`` apuntando a un directorio desechable.
+
+Uso: python load_client.py [puerto] [conexiones] [reservas_por_conexion]
+"""
+
+import asyncio
+import json
+import sys
+import time
+import uuid
+
+
+class BookingClient:
+    """Cliente mínimo del protocolo JSON por líneas."""
+
+    def __init__(self, reader, writer):
+        """Envuelve una conexión abierta."""
+        self._reader = reader
+        self._writer = writer
+        self._next_id = 0
+
+    @classmethod
+    async def connect(cls, host="127.0.0.1", port=8765):
+        """Abre una conexión con el servicio."""
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def call(self, operation, **args):
+        """Envía una solicitud y retorna la respuesta decodificada."""
+        self._next_id += 1
+        request = {"id": self._next_id, "op": operation, "args": args}
+        self._writer.write((json.dumps(request) + "\n").encode('utf-8'))
+        await self._writer.drain()
+        return json.loads(await self._reader.readline())
+
+    async def close(self):
+        """Cierra la conexión."""
+        self._writer.close()
+        await self._writer.wait_closed()
+
+
+def percentile(values, fraction):
+    """Percentil por rango más cercano de una lista ordenada."""
+    if not values:
+        return 0.0
+    position = min(len(values) - 1, int(round(fraction * len(values))) - 1)
+    return values[max(position, 0)]
+
+
+async def run_load(port=8765, connections=50, bookings=100,
+                   host="127.0.0.1"):
+    """
+    Ejecuta la carga y retorna un diccionario con las métricas. Lanza
+    ValueError si el servicio usa los archivos de datos por defecto.
+    """
+    run_id = uuid.uuid4().hex[:8]
+    hotel_id, customer_id = f"LH-{run_id}", f"LC-{run_id}"
+    setup = await BookingClient.connect(host, port)
+    info = await setup.call("info")
+    if not info["ok"] or info["result"]["default_data"]:
+        await setup.close()
+        raise ValueError("El servicio usa los archivos de datos por "
+                         "defecto; inícielo con --data-dir.")
+    await setup.call("create_hotel", hotel_id=hotel_id, name="Carga",
+                     location="Local",
+                     rooms_available=connections * bookings)
+    await setup.call("create_customer", customer_id=customer_id,
+                     name="Carga", email="carga@ejemplo.com")
+    await setup.close()
+
+    latencies = []
+    failures = [0]
+
+    async def worker(number):
+        client = await BookingClient.connect(host, port)
+        for sequence in range(bookings):
+            started = time.perf_counter()
+            response = await client.call(
+                "book", reservation_id=f"LR-{run_id}-{number}-{sequence}",
+                customer_id=customer_id, hotel_id=hotel_id)
+            latencies.append(time.perf_counter() - started)
+            if not response["ok"]:
+                failures[0] += 1
+        await client.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(number) for number in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "bookings": len(latencies),
+        "failures": failures[0],
+        "seconds": elapsed,
+        "bookings_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    """Función principal del generador de carga."""
+    args = [int(value) for value in sys.argv[1:4]]
+    port, connections, bookings = args + [8765, 50, 100][len(args):]
+    try:
+        metrics = asyncio.run(run_load(port, connections, bookings))
+    except ConnectionError as error:
+        print(f"Error: No se pudo conectar al servicio: {error}")
+        return
+    except ValueError as error:
+        print(f"Error: {error}")
+        return
+    print("----------- PRUEBA DE CARGA -----------")
+    print(f"Reservas: {metrics['bookings']} "
+          f"(fallidas: {metrics['failures']})")
+    print(f"Reservas por segundo: {metrics['bookings_per_second']:.1f}")
+    print(f"Latencia p50: {metrics['p50_ms']:.2f} ms")
+    print(f"Latencia p99: {metrics['p99_ms']:.2f} ms")
+    print("---------------------------------------")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,8 @@
 """Script principal para demostrar la ejecución del sistema."""
 
-from reservation_system import Hotel, Customer, Reservation
+from reservation_system import (
+    Hotel, Customer, Reservation, ReservationService
+)
 
 def main():
     """Ejecuta pruebas manuales en consola."""
@@ -17,8 +19,9 @@ def main():
     # 2. Hacer una reservación (Req 2)
     print("\n--- Creando una Reservación ---")
     res = Reservation("R01", "C01", "H01")
-    if Reservation.create_reservation(res):
-        Hotel.reserve_room("H01")
+    service = ReservationService()
+    if service.book(res):
+        service.checkpoint()
         print("¡Reservación R01 creada con éxito para Daniel en Hotel Tequendama!")
 
     # 3. Mostrar cómo bajó la disponibilidad
@@ -3,43 +3,208 @@ Módulo para la gestión del sistema de reservaciones de hoteles.
 
 Contiene las clases Hotel, Customer y Reservation, permitiendo la
 persistencia de datos en archivos JSON y el manejo de errores.
+El formato de cada archivo lo decide su extensión (ver ``storage``), y
+``storage.import_json`` permite migrar los archivos JSON existentes.
 """
 
-import json
 import os
+from collections import namedtuple
+from contextlib import ExitStack, contextmanager
+
+from availability import AvailabilityIndex, parse_date
+from storage import (
+    Journal, file_version, iter_records, journal_op, locked, open_table,
+    write_records
+)
 
 
 def load_data(filename):
     """
-    Carga los datos desde un archivo JSON.
+    Carga los datos desde un archivo (JSON, bitácora o SQLite).
     Maneja datos inválidos mostrando un error y continuando la ejecución.
     """
-    if not os.path.exists(filename):
-        return []
+    return open_table(filename).records()
 
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            return json.load(file)
-    except json.JSONDecodeError:
-        print(f"Error: El archivo {filename} contiene datos inválidos.")
-        return []
-    except IOError as error:
-        print(f"Error de lectura en el archivo {filename}: {error}")
+
+def load_versioned_data(filename):
+    """Carga los datos junto con la versión del archivo leída."""
+    with locked(filename):
+        return open_table(filename).records(), file_version(filename)
+
+
+def save_data(data, filename, expected_version=None):
+    """
+    Guarda los datos en el archivo, reemplazando su contenido.
+
+    Si se indica ``expected_version`` (obtenida con load_versioned_data),
+    la escritura solo ocurre si nadie modificó el archivo desde entonces.
+    """
+    with locked(filename):
+        table = open_table(filename)
+        if not isinstance(data, list) or not table.accepts(data):
+            print(f"Error: Los datos para {filename} son inválidos.")
+            return False
+        if (expected_version is not None
+                and file_version(filename) != expected_version):
+            print(f"Error: El archivo {filename} fue modificado por otro "
+                  "proceso.")
+            return False
+        table.replace_all(data)
+        return True
+
+
+def _modify_record(table, record_id, key, new_val):
+    """
+    Modifica un campo de un registro; retorna None si el registro no existe
+    y False si el campo no existe. Lanza ValueError si se cambia el ID por
+    uno que ya pertenece a otro registro.
+    """
+    record = table.get(record_id)
+    if record is None:
+        return None
+    if key not in record:
+        return False
+    updated = dict(record)
+    updated[key] = new_val
+    if key == table.key and new_val != record_id:
+        if isinstance(new_val, (list, dict)):
+            raise ValueError(f"El ID {new_val} no es válido.")
+        if table.get(new_val) is not None:
+            raise ValueError(f"El ID {new_val} ya existe.")
+        table.delete(record_id)
+    table.put(updated)
+    return True
+
+
+def _iso_date(value):
+    """Normaliza una fecha opcional a texto ISO."""
+    return None if value is None else parse_date(value).isoformat()
+
+
+# Resultado por elemento de las operaciones en lote
+BatchResult = namedtuple("BatchResult", ["record_id", "ok", "error"])
+
+
+class Record:
+    """
+    Base de las entidades: registros compactos con ``__slots__`` (sin
+    ``__dict__`` por instancia) y carga/exportación en bloque.
+
+    El orden de ``__slots__`` coincide con el de los argumentos del
+    constructor de cada entidad. Cada entidad define ``KEY`` (campo ID),
+    ``FILENAME`` (archivo por defecto) e ``INDEXES`` (índices secundarios).
+    """
+
+    __slots__ = ()
+
+    KEY = None
+    FILENAME = None
+    INDEXES = ()
+
+    @classmethod
+    def from_dict(cls, data):
+        """Crea una instancia a partir de un diccionario."""
+        return cls(*(data.get(field) for field in cls.__slots__))
+
+    @classmethod
+    def import_many(cls, filename):
+        """
+        Carga todas las instancias de un archivo de intercambio
+        (JSON Lines, JSON o MessagePack).
+        """
+        try:
+            return [cls.from_dict(data) for data in iter_records(filename)]
+        except FileNotFoundError:
+            print(f"Error: El archivo '{filename}' no fue encontrado.")
+        except ValueError:
+            print(f"Error: El archivo {filename} contiene datos inválidos.")
+        except ImportError as error:
+            print(f"Error: {error}")
         return []
 
+    @classmethod
+    def create_many(cls, items, filename=None):
+        """
+        Crea varias instancias con una sola lectura y una sola escritura.
+        Los IDs repetidos (en el archivo o en el lote) se rechazan.
+        """
+        filename = filename or cls.FILENAME
+        results = []
+        with locked(filename):
+            table = open_table(filename, cls.KEY, cls.INDEXES)
+            with table.batch():
+                for item in items:
+                    record = item.to_dict()
+                    record_id = record[cls.KEY]
+                    if table.get(record_id) is not None:
+                        results.append(
+                            BatchResult(record_id, False, "Ya existe."))
+                        continue
+                    table.put(record)
+                    results.append(BatchResult(record_id, True, None))
+        return results
+
+    @classmethod
+    def delete_many(cls, record_ids, filename=None):
+        """Elimina varias instancias con una sola escritura."""
+        filename = filename or cls.FILENAME
+        results = []
+        with locked(filename):
+            table = open_table(filename, cls.KEY, cls.INDEXES)
+            with table.batch():
+                for record_id in record_ids:
+                    deleted = table.delete(record_id)
+                    results.append(BatchResult(
+                        record_id, deleted, None if deleted
+                        else "No encontrado."))
+        return results
 
-def save_data(data, filename):
-    """Guarda los datos en un archivo JSON."""
-    try:
-        with open(filename, 'w', encoding='utf-8') as file:
-            json.dump(data, file, indent=4)
-    except IOError as error:
-        print(f"Error al guardar en el archivo {filename}: {error}")
+    @classmethod
+    def modify_many(cls, changes, filename=None):
+        """
+        Aplica varias modificaciones ``(id, campo, valor)`` con una sola
+        escritura.
+        """
+        filename = filename or cls.FILENAME
+        results = []
+        with locked(filename):
+            table = open_table(filename, cls.KEY, cls.INDEXES)
+            with table.batch():
+                for record_id, key, new_val in changes:
+                    try:
+                        result = _modify_record(table, record_id, key,
+                                                new_val)
+                    except ValueError as duplicate:
+                        results.append(
+                            BatchResult(record_id, False, str(duplicate)))
+                        continue
+                    error = {None: "No encontrado.",
+                             False: f"La propiedad '{key}' no existe.",
+                             True: None}[result]
+                    results.append(
+                        BatchResult(record_id, bool(result), error))
+        return results
 
+    @classmethod
+    def export_many(cls, items, filename):
+        """Escribe las instancias en bloque; retorna cuántas escribió."""
+        try:
+            return write_records((item.to_dict() for item in items),
+                                 filename)
+        except (IOError, ImportError) as error:
+            print(f"Error al guardar en el archivo {filename}: {error}")
+            return 0
 
-class Hotel:
+
+class Hotel(Record):
     """Representa un hotel en el sistema de reservaciones."""
 
+    __slots__ = ("hotel_id", "name", "location", "rooms_available")
+
+    KEY = "hotel_id"
+    FILENAME = "hotels.json"
+    INDEXES = ("location",)
+
     def __init__(self, hotel_id, name, location, rooms_available):
         """Inicializa un nuevo hotel."""
         self.hotel_id = hotel_id
@@ -59,41 +224,39 @@ class Hotel:
     @classmethod
     def create_hotel(cls, hotel_data, filename="hotels.json"):
         """Guarda un nuevo hotel en el archivo."""
-        hotels = load_data(filename)
+        with locked(filename):
+            hotels = open_table(filename, cls.KEY, cls.INDEXES)
 
-        if any(h.get("hotel_id") == hotel_data.hotel_id for h in hotels):
-            print(f"Error: El hotel {hotel_data.hotel_id} ya existe.")
-            return False
+            if hotels.get(hotel_data.hotel_id) is not None:
+                print(f"Error: El hotel {hotel_data.hotel_id} ya existe.")
+                return False
 
-        hotels.append(hotel_data.to_dict())
-        save_data(hotels, filename)
-        return True
+            hotels.put(hotel_data.to_dict())
+            return True
 
     @classmethod
     def delete_hotel(cls, hotel_id, filename="hotels.json"):
         """Elimina un hotel del archivo usando su ID."""
-        hotels = load_data(filename)
-        updated_hotels = [h for h in hotels if h.get("hotel_id") != hotel_id]
+        with locked(filename):
+            hotels = open_table(filename, cls.KEY, cls.INDEXES)
 
-        if len(hotels) == len(updated_hotels):
-            print("Error: Hotel no encontrado para eliminar.")
-            return False
+            if not hotels.delete(hotel_id):
+                print("Error: Hotel no encontrado para eliminar.")
+                return False
 
-        save_data(updated_hotels, filename)
-        return True
+            return True
 
     @classmethod
     def display_hotel_info(cls, hotel_id, filename="hotels.json"):
         """Muestra en consola la información de un hotel y la retorna."""
-        hotels = load_data(filename)
-        for hotel in hotels:
-            if hotel.get("hotel_id") == hotel_id:
-                print("--- Información del Hotel ---")
-                print(f"ID: {hotel['hotel_id']}")
-                print(f"Nombre: {hotel['name']}")
-                print(f"Ubicación: {hotel['location']}")
-                print(f"Habitaciones: {hotel['rooms_available']}")
-                return hotel
+        hotel = open_table(filename, cls.KEY, cls.INDEXES).get(hotel_id)
+        if hotel is not None:
+            print("--- Información del Hotel ---")
+            print(f"ID: {hotel['hotel_id']}")
+            print(f"Nombre: {hotel['name']}")
+            print(f"Ubicación: {hotel['location']}")
+            print(f"Habitaciones: {hotel['rooms_available']}")
+            return hotel
 
         print("Error: Hotel no encontrado.")
         return None
@@ -101,52 +264,68 @@ class Hotel:
     @classmethod
     def modify_hotel_info(cls, hotel_id, key, new_val, filename="hotels.json"):
         """Modifica un campo específico de un hotel existente."""
-        hotels = load_data(filename)
-        for hotel in hotels:
-            if hotel.get("hotel_id") == hotel_id:
-                if key in hotel:
-                    hotel[key] = new_val
-                    save_data(hotels, filename)
-                    return True
-                print(f"Error: La propiedad '{key}' no existe en el hotel.")
+        with locked(filename):
+            hotels = open_table(filename, cls.KEY, cls.INDEXES)
+            try:
+                result = _modify_record(hotels, hotel_id, key, new_val)
+            except ValueError as duplicate:
+                print(f"Error: {duplicate}")
                 return False
-
-        print("Error: Hotel no encontrado para modificar.")
-        return False
+            if result is None:
+                print("Error: Hotel no encontrado para modificar.")
+                return False
+            if not result:
+                print(f"Error: La propiedad '{key}' no existe en el hotel.")
+            return result
 
     @classmethod
     def reserve_room(cls, hotel_id, filename="hotels.json"):
         """Resta una habitación de la disponibilidad del hotel."""
-        hotels = load_data(filename)
-        for hotel in hotels:
-            if hotel.get("hotel_id") == hotel_id:
-                if hotel["rooms_available"] > 0:
-                    hotel["rooms_available"] -= 1
-                    save_data(hotels, filename)
-                    return True
-                print("Error: No hay habitaciones disponibles.")
+        with locked(filename):
+            hotels = open_table(filename, cls.KEY, cls.INDEXES)
+            hotel = hotels.get(hotel_id)
+            if hotel is None:
+                print("Error: Hotel no encontrado para reserva.")
                 return False
 
-        print("Error: Hotel no encontrado para reserva.")
-        return False
+            if hotel["rooms_available"] > 0:
+                hotels.put(dict(hotel,
+                                rooms_available=hotel["rooms_available"] - 1))
+                return True
+            print("Error: No hay habitaciones disponibles.")
+            return False
+
+    @classmethod
+    def find_available(cls, location, filename="hotels.json"):
+        """Retorna los hoteles de ``location`` con habitaciones libres."""
+        hotels = open_table(filename, cls.KEY, cls.INDEXES)
+        return [hotel for hotel in hotels.find("location", location)
+                if hotel["rooms_available"] > 0]
 
     @classmethod
     def cancel_reservation(cls, hotel_id, filename="hotels.json"):
         """Suma una habitación a la disponibilidad del hotel."""
-        hotels = load_data(filename)
-        for hotel in hotels:
-            if hotel.get("hotel_id") == hotel_id:
-                hotel["rooms_available"] += 1
-                save_data(hotels, filename)
-                return True
+        with locked(filename):
+            hotels = open_table(filename, cls.KEY, cls.INDEXES)
+            hotel = hotels.get(hotel_id)
+            if hotel is None:
+                print("Error: Hotel no encontrado para cancelar reserva.")
+                return False
 
-        print("Error: Hotel no encontrado para cancelar reserva.")
-        return False
+            hotels.put(dict(hotel,
+                            rooms_available=hotel["rooms_available"] + 1))
+            return True
 
 
-class Customer:
+class Customer(Record):
     """Representa un cliente en el sistema de reservaciones."""
 
+    __slots__ = ("customer_id", "name", "email")
+
+    KEY = "customer_id"
+    FILENAME = "customers.json"
+    INDEXES = ()
+
     def __init__(self, customer_id, name, email):
         """Inicializa un nuevo cliente."""
         self.customer_id = customer_id
@@ -164,41 +343,39 @@ class Customer:
     @classmethod
     def create_customer(cls, customer_data, filename="customers.json"):
         """Crea un cliente y lo guarda en el archivo."""
-        customers = load_data(filename)
+        with locked(filename):
+            customers = open_table(filename, cls.KEY, cls.INDEXES)
 
-        if any(c.get("customer_id") == customer_data.customer_id
-               for c in customers):
-            print(f"Error: El cliente {customer_data.customer_id} ya existe.")
-            return False
+            if customers.get(customer_data.customer_id) is not None:
+                print(f"Error: El cliente {customer_data.customer_id} "
+                      "ya existe.")
+                return False
 
-        customers.append(customer_data.to_dict())
-        save_data(customers, filename)
-        return True
+            customers.put(customer_data.to_dict())
+            return True
 
     @classmethod
     def delete_customer(cls, customer_id, filename="customers.json"):
         """Elimina un cliente del archivo."""
-        customers = load_data(filename)
-        updated = [c for c in customers if c.get("customer_id") != customer_id]
+        with locked(filename):
+            customers = open_table(filename, cls.KEY, cls.INDEXES)
 
-        if len(customers) == len(updated):
-            print("Error: Cliente no encontrado para eliminar.")
-            return False
+            if not customers.delete(customer_id):
+                print("Error: Cliente no encontrado para eliminar.")
+                return False
 
-        save_data(updated, filename)
-        return True
+            return True
 
     @classmethod
     def display_customer_info(cls, customer_id, filename="customers.json"):
         """Muestra la información de un cliente específico."""
-        customers = load_data(filename)
-        for customer in customers:
-            if customer.get("customer_id") == customer_id:
-                print("--- Información del Cliente ---")
-                print(f"ID: {customer['customer_id']}")
-                print(f"Nombre: {customer['name']}")
-                print(f"Email: {customer['email']}")
-                return customer
+        customer = open_table(filename, cls.KEY, cls.INDEXES).get(customer_id)
+        if customer is not None:
+            print("--- Información del Cliente ---")
+            print(f"ID: {customer['customer_id']}")
+            print(f"Nombre: {customer['name']}")
+            print(f"Email: {customer['email']}")
+            return customer
 
         print("Error: Cliente no encontrado.")
         return None
@@ -207,63 +384,307 @@ class Customer:
     def modify_customer_info(cls, customer_id, key, new_val,
                              filename="customers.json"):
         """Modifica la información de un cliente existente."""
-        customers = load_data(filename)
-        for customer in customers:
-            if customer.get("customer_id") == customer_id:
-                if key in customer:
-                    customer[key] = new_val
-                    save_data(customers, filename)
-                    return True
-                print(f"Error: La propiedad '{key}' no existe.")
+        with locked(filename):
+            customers = open_table(filename, cls.KEY, cls.INDEXES)
+            try:
+                result = _modify_record(customers, customer_id, key, new_val)
+            except ValueError as duplicate:
+                print(f"Error: {duplicate}")
                 return False
-
-        print("Error: Cliente no encontrado para modificar.")
-        return False
+            if result is None:
+                print("Error: Cliente no encontrado para modificar.")
+                return False
+            if not result:
+                print(f"Error: La propiedad '{key}' no existe.")
+            return result
 
 
-class Reservation:
+class Reservation(Record):
     """Maneja las reservaciones vinculando clientes y hoteles."""
 
-    def __init__(self, reservation_id, customer_id, hotel_id):
-        """Inicializa una nueva reservación."""
+    __slots__ = ("reservation_id", "customer_id", "hotel_id", "check_in",
+                 "check_out")
+
+    KEY = "reservation_id"
+    FILENAME = "reservations.json"
+    INDEXES = ("customer_id", "hotel_id")
+
+    def __init__(self, reservation_id, customer_id, hotel_id,
+                 check_in=None, check_out=None):
+        """
+        Inicializa una nueva reservación.
+
+        ``check_in`` y ``check_out`` (fecha ISO o ``date``) son opcionales;
+        sin ellas la reservación ocupa una habitación sin fechas. Lanza
+        ValueError si solo se indica una de las dos.
+        """
+        if (check_in is None) != (check_out is None):
+            raise ValueError("Se requieren ambas fechas o ninguna.")
         self.reservation_id = reservation_id
         self.customer_id = customer_id
         self.hotel_id = hotel_id
+        self.check_in = _iso_date(check_in)
+        self.check_out = _iso_date(check_out)
 
     def to_dict(self):
         """Convierte la reservación a diccionario."""
-        return {
+        data = {
             "reservation_id": self.reservation_id,
             "customer_id": self.customer_id,
             "hotel_id": self.hotel_id
         }
+        if self.check_in is not None:
+            data["check_in"] = self.check_in
+            data["check_out"] = self.check_out
+        return data
 
     @classmethod
     def create_reservation(cls, res_data, filename="reservations.json"):
         """Crea una reservación vinculando cliente y hotel."""
-        reservations = load_data(filename)
+        with locked(filename):
+            reservations = open_table(filename, cls.KEY, cls.INDEXES)
 
-        if any(r.get("reservation_id") == res_data.reservation_id
-               for r in reservations):
-            print(f"Error: Reservación {res_data.reservation_id} ya existe.")
-            return False
+            if reservations.get(res_data.reservation_id) is not None:
+                print(f"Error: Reservación {res_data.reservation_id} "
+                      "ya existe.")
+                return False
 
-        reservations.append(res_data.to_dict())
-        save_data(reservations, filename)
-        return True
+            reservations.put(res_data.to_dict())
+            return True
 
     @classmethod
     def cancel_reservation(cls, reservation_id, filename="reservations.json"):
         """Cancela una reservación existente."""
-        reservations = load_data(filename)
-        updated = [
-            r for r in reservations
-            if r.get("reservation_id") != reservation_id
-        ]
-
-        if len(reservations) == len(updated):
-            print("Error: Reservación no encontrada para cancelar.")
-            return False
+        with locked(filename):
+            reservations = open_table(filename, cls.KEY, cls.INDEXES)
 
-        save_data(updated, filename)
-        return True
+            if not reservations.delete(reservation_id):
+                print("Error: Reservación no encontrada para cancelar.")
+                return False
+
+            return True
+
+    @classmethod
+    def find_by_customer(cls, customer_id, filename="reservations.json"):
+        """Retorna las reservaciones de un cliente."""
+        reservations = open_table(filename, cls.KEY, cls.INDEXES)
+        return reservations.find("customer_id", customer_id)
+
+    @classmethod
+    def find_by_hotel(cls, hotel_id, filename="reservations.json"):
+        """Retorna las reservaciones de un hotel."""
+        reservations = open_table(filename, cls.KEY, cls.INDEXES)
+        return reservations.find("hotel_id", hotel_id)
+
+
+class ReservationService:
+    """
+    Reserva y cancela actualizando hotel y reservación en una sola
+    transacción.
+
+    Valida que existan el cliente y el hotel, toma los candados de ambos
+    archivos una sola vez y confirma los dos cambios con un único fsync en
+    la bitácora de intención (``<reservaciones>.journal``), de modo que una
+    caída nunca deja una reservación sin descontar su habitación.
+
+    Las reservaciones con fechas no descuentan ``rooms_available``: ocupan
+    una habitación por noche en el índice de disponibilidad del hotel,
+    cuya capacidad es ``rooms_total`` (o ``rooms_available`` si no existe).
+    """
+
+    def __init__(self, hotels_file="hotels.json",
+                 customers_file="customers.json",
+                 reservations_file="reservations.json",
+                 checkpoint_interval=None):
+        """Configura los archivos y recupera transacciones pendientes."""
+        self.hotels_file = hotels_file
+        self.customers_file = customers_file
+        self.reservations_file = reservations_file
+        self.journal = Journal(reservations_file + ".journal",
+                               checkpoint_interval)
+        self.availability = AvailabilityIndex()
+        self._reservations_version = None
+        with self._locked():
+            self.journal.recover()
+
+    def table(self, entity):
+        """Abre la tabla de ``entity`` (Hotel, Customer o Reservation)."""
+        filename = {
+            Hotel: self.hotels_file,
+            Customer: self.customers_file,
+            Reservation: self.reservations_file,
+        }[entity]
+        return open_table(filename, entity.KEY, entity.INDEXES)
+
+    def _inventory(self, hotel, reservations):
+        """
+        Retorna el inventario por fechas del hotel. Si otro proceso cambió
+        las reservaciones desde la última operación, el índice se rehace.
+        """
+        version = file_version(self.reservations_file)
+        if version != self._reservations_version:
+            self.availability.clear()
+            self._reservations_version = version
+        return self.availability.inventory(
+            hotel, reservations.find("hotel_id", hotel["hotel_id"]))
+
+    def _commit(self, ops):
+        """Confirma una transacción y registra la versión resultante."""
+        self.journal.commit(ops)
+        self._reservations_version = file_version(self.reservations_file)
+
+    @contextmanager
+    def _availability_guard(self):
+        """
+        Descarta el índice de disponibilidad si el bloque falla: el árbol
+        se modifica antes de confirmar y solo vale si la bitácora registró
+        el cambio. El índice se rehace del archivo en la siguiente consulta.
+        """
+        try:
+            yield
+        except BaseException:
+            self.availability.clear()
+            raise
+
+    def _locked(self):
+        """Toma los candados de hoteles y reservaciones en orden fijo."""
+        stack = ExitStack()
+        for filename in sorted({self.hotels_file, self.reservations_file},
+                               key=os.path.abspath):
+            stack.enter_context(locked(filename))
+        return stack
+
+    def book(self, res_data):
+        """Registra la reservación y descuenta una habitación del hotel."""
+        result = self.book_many([res_data])[0]
+        if not result.ok:
+            print(f"Error: {result.error}")
+        return result.ok
+
+    def book_many(self, items):
+        """
+        Registra varias reservaciones en una sola transacción: un candado,
+        una lectura de cada archivo, una escritura y un fsync. Retorna un
+        BatchResult por reservación; las fallidas no impiden las demás.
+        """
+        with self._locked(), self._availability_guard():
+            tables = (self.table(Customer), self.table(Hotel),
+                      self.table(Reservation))
+            updated_hotels, booked_ids = {}, set()
+            ops, results = [], []
+            for res_data in items:
+                error = self._book_error(res_data, tables, updated_hotels,
+                                         booked_ids)
+                results.append(BatchResult(res_data.reservation_id,
+                                           error is None, error))
+                if error is None:
+                    booked_ids.add(res_data.reservation_id)
+                    ops.append(journal_op(tables[2], res_data.reservation_id,
+                                          None, res_data.to_dict()))
+            for hotel_id, hotel in updated_hotels.items():
+                ops.append(journal_op(tables[1], hotel_id,
+                                      tables[1].get(hotel_id), hotel))
+            if ops:
+                self._commit(ops)
+            return results
+
+    def _book_error(self, res_data, tables, updated_hotels, booked_ids):
+        """
+        Valida y aparta una reservación del lote. Retorna el motivo del
+        rechazo o None; los hoteles modificados quedan en updated_hotels y
+        booked_ids tiene las reservaciones ya aceptadas en el lote.
+        """
+        hotel, error = self._check_references(res_data, tables,
+                                              updated_hotels, booked_ids)
+        if error is not None:
+            return error
+
+        if res_data.check_in is not None:
+            return self._book_dates(res_data, hotel, tables[2])
+
+        if hotel["rooms_available"] <= 0:
+            return "No hay habitaciones disponibles."
+        updated_hotels[res_data.hotel_id] = dict(
+            hotel, rooms_available=hotel["rooms_available"] - 1)
+        return None
+
+    @staticmethod
+    def _check_references(res_data, tables, updated_hotels, booked_ids):
+        """
+        Verifica que existan el cliente y el hotel y que el ID de la
+        reservación esté libre. Retorna (hotel, motivo del rechazo o None).
+        """
+        customers, hotels, reservations = tables
+        if customers.get(res_data.customer_id) is None:
+            return None, "Cliente no encontrado para reserva."
+
+        hotel = (updated_hotels.get(res_data.hotel_id)
+                 or hotels.get(res_data.hotel_id))
+        if hotel is None:
+            return None, "Hotel no encontrado para reserva."
+
+        if (res_data.reservation_id in booked_ids
+                or reservations.get(res_data.reservation_id) is not None):
+            return hotel, f"Reservación {res_data.reservation_id} ya existe."
+        return hotel, None
+
+    def _book_dates(self, res_data, hotel, reservations):
+        """Aparta las noches de una reservación con fechas en el índice."""
+        try:
+            inventory = self._inventory(hotel, reservations)
+            booked = inventory.book(res_data.check_in, res_data.check_out)
+        except (TypeError, ValueError):
+            return "Fechas de reservación inválidas."
+        return None if booked else (
+            "No hay habitaciones disponibles en esas fechas.")
+
+    def cancel(self, reservation_id):
+        """Elimina la reservación y devuelve la habitación al hotel."""
+        with self._locked(), self._availability_guard():
+            reservations = self.table(Reservation)
+            reservation = reservations.get(reservation_id)
+            if reservation is None:
+                print("Error: Reservación no encontrada para cancelar.")
+                return False
+
+            ops = [journal_op(reservations, reservation_id, reservation,
+                              None)]
+            hotels = self.table(Hotel)
+            hotel = hotels.get(reservation["hotel_id"])
+            if hotel is not None and reservation.get("check_in"):
+                self._inventory(hotel, reservations).release(
+                    reservation["check_in"], reservation["check_out"])
+            elif hotel is not None:
+                ops.append(journal_op(
+                    hotels, reservation["hotel_id"], hotel,
+                    dict(hotel, rooms_available=hotel["rooms_available"] + 1)
+                ))
+            self._commit(ops)
+            return True
+
+    def free_rooms(self, hotel_id, check_in, check_out):
+        """
+        Habitaciones libres en todas las noches entre ``check_in`` y
+        ``check_out``; None si el hotel no existe o las fechas son inválidas.
+        """
+        hotel = self.table(Hotel).get(hotel_id)
+        if hotel is None:
+            print("Error: Hotel no encontrado.")
+            return None
+        reservations = self.table(Reservation)
+        try:
+            return self._inventory(hotel, reservations).free_rooms(
+                check_in, check_out)
+        except ValueError:
+            print("Error: Fechas de reservación inválidas.")
+            return None
+
+    def is_available(self, hotel_id, check_in, check_out):
+        """Indica si queda al menos una habitación en todo el rango."""
+        free = self.free_rooms(hotel_id, check_in, check_out)
+        return free is not None and free > 0
+
+    def checkpoint(self):
+        """Fuerza a disco los cambios confirmados y vacía la bitácora."""
+        with self._locked():
+            self.journal.checkpoint()
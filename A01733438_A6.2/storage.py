@@ -0,0 +1,964 @@
+"""
+Motores de almacenamiento para el sistema de reservaciones.
+
+Cada archivo de datos se abre como una tabla con un índice en memoria
+(diccionario por ID), de modo que las lecturas y escrituras puntuales no
+requieren recorrer todos los registros. El motor se elige por la extensión
+del archivo:
+
+* ``.json``: formato original (arreglo JSON completo, se reescribe entero).
+* ``.jsonl`` / ``.log``: bitácora de solo-anexado con compactación
+  periódica.
+* ``.db`` / ``.sqlite`` / ``.sqlite3``: archivo SQLite local.
+
+Se pueden registrar motores adicionales con ``register_backend``.
+
+Las escrituras son atómicas (archivo temporal + ``os.replace``) y
+``locked`` serializa las operaciones de lectura-modificación-escritura
+entre procesos mediante un candado sobre ``<archivo>.lock`` (``fcntl`` en
+POSIX, ``msvcrt`` en Windows); sin ninguno de los dos lanza OSError.
+``Journal`` agrupa cambios en varios archivos en una sola transacción.
+
+Las tablas abiertas funcionan como un repositorio en memoria: solo se
+vuelven a leer cuando cambia la firma del archivo (inodo, tamaño, mtime),
+por lo que las consultas repetidas no parsean el archivo. Con
+``set_flush_interval`` las escrituras de JSON y bitácora se acumulan y se
+vuelcan juntas al vencer el intervalo, con ``flush_all`` o al terminar el
+proceso (SQLite siempre confirma de inmediato); en ese
+modo los cambios pendientes no son visibles para otros procesos hasta el
+volcado, así que el candado entre procesos solo es estricto con el
+intervalo por defecto (0, escritura inmediata).
+"""
+
+import atexit
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: candado con msvcrt
+    fcntl = None
+
+try:
+    import msvcrt
+except ImportError:  # POSIX: candado con fcntl
+    msvcrt = None
+
+try:
+    import msgpack
+except ImportError:  # Formato binario opcional
+    msgpack = None
+
+
+def _dumps(value):
+    """Serializa a JSON compacto (sin sangría ni espacios)."""
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"))
+
+
+def _copy(record):
+    """
+    Copia superficial de un registro: la caché nunca entrega ni guarda los
+    diccionarios del llamador, así que editarlos sin guardar no la altera.
+    """
+    return dict(record) if isinstance(record, dict) else record
+
+
+def _infer_key(record):
+    """Deduce el campo identificador de un registro (``*_id`` o ``id``)."""
+    for field in record:
+        if field.endswith("_id"):
+            return field
+    return "id" if "id" in record else None
+
+
+def _file_signature(filename):
+    """Retorna (inodo, tamaño, mtime) del archivo o None si no existe."""
+    try:
+        stat = os.stat(filename)
+    except OSError:
+        return None
+    return stat.st_ino, stat.st_size, stat.st_mtime_ns
+
+
+_SYNC_STATE = threading.local()
+
+
+@contextmanager
+def deferred_sync():
+    """
+    Omite los fsync de los anexos a bitácoras y de los directorios hechos
+    dentro del bloque.
+
+    El temporal de ``_replace_file`` se fuerza a disco de todos modos:
+    renombrarlo sin fsync puede dejar un archivo vacío tras una caída, y
+    la bitácora de intención solo guarda cambios por registro, no el
+    archivo completo. Sin el fsync del directorio, una caída deja el
+    archivo anterior o el nuevo, ambos completos.
+
+    Solo debe usarse cuando otra bitácora ya garantiza la durabilidad de
+    esos cambios (ver ``Journal``).
+    """
+    previous = getattr(_SYNC_STATE, "deferred", False)
+    _SYNC_STATE.deferred = True
+    try:
+        yield
+    finally:
+        _SYNC_STATE.deferred = previous
+
+
+def _fsync(file):
+    """Fuerza a disco el contenido de un archivo abierto."""
+    if not getattr(_SYNC_STATE, "deferred", False):
+        file.flush()
+        os.fsync(file.fileno())
+
+
+def _fsync_directory(filename):
+    """Persiste la entrada de directorio tras un ``os.replace``."""
+    if (not hasattr(os, "O_DIRECTORY")
+            or getattr(_SYNC_STATE, "deferred", False)):
+        return
+    descriptor = os.open(os.path.dirname(os.path.abspath(filename)),
+                         os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(descriptor)
+    finally:
+        os.close(descriptor)
+
+
+def _replace_file(filename, text):
+    """
+    Escribe ``text`` en un temporal y lo reemplaza sobre ``filename``.
+
+    Un fallo a mitad de la escritura deja intacto el archivo anterior.
+    """
+    temp_name = f"{filename}.tmp{os.getpid()}"
+    try:
+        with open(temp_name, 'w', encoding='utf-8') as file:
+            file.write(text)
+            file.flush()
+            os.fsync(file.fileno())  # También con deferred_sync
+        os.replace(temp_name, filename)
+    except OSError:
+        if os.path.exists(temp_name):
+            os.remove(temp_name)
+        raise
+    _fsync_directory(filename)
+
+
+_HELD_LOCKS = threading.local()
+
+
+@contextmanager
+def locked(filename):
+    """
+    Candado exclusivo entre procesos para ``filename``.
+
+    Es reentrante dentro de un mismo hilo, de modo que una operación que
+    ya tiene el candado puede llamar a otra que también lo pide.
+    """
+    path = os.path.abspath(filename)
+    held = _HELD_LOCKS.__dict__.setdefault("paths", set())
+    if path in held:
+        yield
+        return
+    with open(path + ".lock", 'a', encoding='utf-8') as lock_file:
+        _lock_file(lock_file)
+        held.add(path)
+        try:
+            yield
+        finally:
+            held.discard(path)
+            _unlock_file(lock_file)
+
+
+def _lock_file(lock_file):
+    """Toma el candado exclusivo del archivo abierto (espera si hace falta)."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        return
+    if msvcrt is None:
+        raise OSError("No hay candado entre procesos en esta plataforma.")
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            return
+        except OSError:  # LK_LOCK se rinde tras 10 intentos de 1 s
+            continue
+
+
+def _unlock_file(lock_file):
+    """Libera el candado tomado con ``_lock_file``."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        return
+    lock_file.seek(0)
+    msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def file_version(filename):
+    """
+    Versión actual de un archivo de datos para control optimista.
+
+    Cambia con cada escritura (el reemplazo atómico crea un inodo nuevo y
+    los anexos cambian el tamaño).
+    """
+    return _file_signature(filename)
+
+
+class Table:
+    """Interfaz común de las tablas: registros indexados por ``key``."""
+
+    def __init__(self, filename, key=None):
+        """Abre la tabla asociada a ``filename``."""
+        self.filename = filename
+        self.key = key
+        self.flush_interval = _FLUSH_INTERVAL[0]
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _mark_dirty(self):
+        """Registra un cambio y lo vuelca si venció el intervalo."""
+        self._dirty = True
+        if (self.flush_interval <= 0 or time.monotonic() - self._last_flush
+                >= self.flush_interval):
+            self.flush()
+
+    def flush(self):
+        """Escribe en disco los cambios pendientes."""
+        if self._dirty:
+            self._dirty = False
+            self._write_pending()
+        self._last_flush = time.monotonic()
+
+    def _write_pending(self):
+        """Persiste los cambios acumulados (propio de cada motor)."""
+
+    @contextmanager
+    def batch(self):
+        """Agrupa las escrituras del bloque en un único volcado al salir."""
+        previous = self.flush_interval
+        self.flush_interval = float("inf")
+        try:
+            yield self
+        finally:
+            self.flush_interval = previous
+            self.flush()
+
+    def _key_of(self, record):
+        """
+        Obtiene el ID de un registro, deduciendo la clave si hace falta.
+        Retorna None si el registro no es un diccionario o su ID no es un
+        valor simple.
+        """
+        if not isinstance(record, dict):
+            return None
+        if self.key is None:
+            self.key = _infer_key(record)
+        record_id = record.get(self.key) if self.key else None
+        return None if isinstance(record_id, (list, dict)) else record_id
+
+    def accepts(self, records):
+        """Indica si la tabla puede guardar ``records`` (con ID simple)."""
+        return all(self._key_of(record) is not None for record in records)
+
+    def refresh(self):
+        """Sincroniza el estado en memoria con el archivo en disco."""
+        raise NotImplementedError
+
+    def records(self):
+        """Retorna la lista de registros en orden de inserción."""
+        raise NotImplementedError
+
+    def get(self, record_id):
+        """Retorna el registro con ese ID o None."""
+        raise NotImplementedError
+
+    def put(self, record):
+        """Inserta o reemplaza un registro."""
+        raise NotImplementedError
+
+    def delete(self, record_id):
+        """Elimina un registro; retorna False si no existía."""
+        raise NotImplementedError
+
+    def replace_all(self, records):
+        """Reemplaza el contenido completo de la tabla."""
+        raise NotImplementedError
+
+    def add_index(self, field):
+        """Mantiene un índice secundario sobre ``field``."""
+
+    def find(self, field, value):
+        """Retorna los registros cuyo ``field`` vale ``value``."""
+        return [record for record in self.records()
+                if record.get(field) == value]
+
+
+# Base intermedia: refresh/put/delete/replace_all dependen del formato en
+# disco y los implementan JsonTable y LogTable; nunca se instancia.
+class MemoryTable(Table):  # pylint: disable=abstract-method
+    """
+    Base de los motores que guardan todos los registros en memoria.
+
+    Además del índice por ID mantiene índices secundarios (valor del campo
+    -> IDs en orden de inserción) que se actualizan en cada alta, baja o
+    modificación, de modo que ``find`` no recorre la tabla.
+    """
+
+    def __init__(self, filename, key=None):
+        super().__init__(filename, key)
+        self._index = {}
+        self._secondary = {}
+
+    def _reset(self):
+        """Vacía el índice principal y los secundarios."""
+        self._index = {}
+        for field in self._secondary:
+            self._secondary[field] = {}
+
+    def _set(self, record_id, record):
+        """Inserta o reemplaza un registro actualizando los índices."""
+        previous = self._index.get(record_id)
+        if previous is not None:
+            self._unlink(record_id, previous)
+        self._index[record_id] = record
+        self._link(record_id, record)
+
+    def _remove(self, record_id):
+        """Quita un registro de los índices; retorna el registro o None."""
+        record = self._index.pop(record_id, None)
+        if record is not None:
+            self._unlink(record_id, record)
+        return record
+
+    def _link(self, record_id, record):
+        """Agrega un registro a los índices secundarios."""
+        for field, buckets in self._secondary.items():
+            value = record.get(field)
+            if value is not None and not isinstance(value, (list, dict)):
+                buckets.setdefault(value, {})[record_id] = None
+
+    def _unlink(self, record_id, record):
+        """Quita un registro de los índices secundarios."""
+        for field, buckets in self._secondary.items():
+            value = record.get(field)
+            bucket = buckets.get(value) if not isinstance(
+                value, (list, dict)) else None
+            if bucket is not None:
+                bucket.pop(record_id, None)
+                if not bucket:
+                    del buckets[value]
+
+    def add_index(self, field):
+        if field in self._secondary:
+            return
+        self._secondary[field] = {}
+        for record_id, record in self._index.items():
+            self._link(record_id, record)
+
+    def find(self, field, value):
+        if field not in self._secondary:
+            return super().find(field, value)
+        bucket = self._secondary[field].get(value, {})
+        return [_copy(self._index[record_id]) for record_id in bucket]
+
+    def records(self):
+        return list(map(_copy, self._index.values()))
+
+    def get(self, record_id):
+        return _copy(self._index.get(record_id))
+
+
+class JsonTable(MemoryTable):
+    """Tabla sobre el formato original: un arreglo JSON en un archivo."""
+
+    def __init__(self, filename, key=None):
+        super().__init__(filename, key)
+        self._signature = False
+        self._rows = 0
+
+    def refresh(self):
+        """Vuelve a leer el archivo completo solo si cambió en disco."""
+        signature = _file_signature(self.filename)
+        if self._dirty or signature == self._signature:
+            return
+        self._signature = signature
+        self._reset()
+        if signature is None:
+            return
+        try:
+            with open(self.filename, 'r', encoding='utf-8') as file:
+                data = json.load(file)
+        except json.JSONDecodeError:
+            print(f"Error: El archivo {self.filename} contiene datos "
+                  "inválidos.")
+            return
+        except IOError as error:
+            print(f"Error de lectura en el archivo {self.filename}: {error}")
+            return
+        if not isinstance(data, list):
+            print(f"Error: El archivo {self.filename} contiene datos "
+                  "inválidos.")
+            return
+        self._load_records(data)
+
+    def _row_id(self):
+        """ID interno para registros sin ID propio (o con ID repetido)."""
+        self._rows += 1
+        return ("__row__", self._rows)
+
+    def _load_records(self, records):
+        """Reconstruye el índice a partir de una lista de registros."""
+        self._reset()
+        for record in records:
+            record_id = self._key_of(record)
+            if record_id is None or record_id in self._index:
+                record_id = self._row_id()
+            self._set(record_id, record)
+
+    def accepts(self, records):
+        """El arreglo JSON admite cualquier valor, como el formato original."""
+        return True
+
+    def _write_pending(self):
+        """Reescribe el archivo completo de forma atómica."""
+        try:
+            _replace_file(self.filename,
+                          _dumps(list(self._index.values())))
+        except IOError as error:
+            print(f"Error al guardar en el archivo {self.filename}: {error}")
+        self._signature = _file_signature(self.filename)
+
+    def put(self, record):
+        record = _copy(record)
+        record_id = self._key_of(record)
+        self._set(self._row_id() if record_id is None else record_id, record)
+        self._mark_dirty()
+
+    def delete(self, record_id):
+        if self._remove(record_id) is None:
+            return False
+        self._mark_dirty()
+        return True
+
+    def replace_all(self, records):
+        self._load_records(list(map(_copy, records)))
+        self._dirty = True
+        self.flush()
+
+
+class LogTable(MemoryTable):
+    """
+    Tabla sobre una bitácora JSON Lines de solo-anexado.
+
+    Cada escritura agrega una línea ``{"put": registro}`` o ``{"del": id}``.
+    Cuando las entradas obsoletas superan a las vigentes, la bitácora se
+    compacta reescribiendo solo los registros vivos.
+    """
+
+    COMPACT_MIN_ENTRIES = 1000
+
+    def __init__(self, filename, key=None):
+        super().__init__(filename, key)
+        self._signature = None
+        self._offset = 0
+        self._garbage = 0
+        self._pending = []
+
+    def refresh(self):
+        """Reproduce solo la parte nueva de la bitácora, si la hay."""
+        if not self._dirty:
+            self._sync_from_disk()
+
+    def _sync_from_disk(self):
+        """Alinea el índice con la bitácora en disco."""
+        signature = _file_signature(self.filename)
+        if signature is None:
+            self._reset()
+            self._offset, self._garbage = 0, 0
+            self._signature = None
+            return
+        if (self._signature is None or signature[0] != self._signature[0]
+                or signature[1] < self._offset):
+            self._reset()
+            self._offset, self._garbage = 0, 0
+        if signature[1] > self._offset:
+            self._replay()
+        self._signature = _file_signature(self.filename)
+
+    def _replay(self):
+        """Aplica las entradas a partir de la última posición leída."""
+        try:
+            with open(self.filename, 'rb') as file:
+                file.seek(self._offset)
+                chunk = file.read()
+        except IOError as error:
+            print(f"Error de lectura en el archivo {self.filename}: {error}")
+            return
+        # Una línea incompleta al final (escritura interrumpida) se ignora
+        complete = chunk[:chunk.rfind(b"\n") + 1]
+        for line in complete.splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (json.JSONDecodeError, AttributeError, TypeError):
+                print(f"Error: El archivo {self.filename} contiene datos "
+                      "inválidos.")
+        self._offset += len(complete)
+
+    def _apply(self, entry):
+        """Aplica una entrada de la bitácora al índice en memoria."""
+        if "put" in entry:
+            record = entry["put"]
+            record_id = self._key_of(record)
+            if record_id in self._index:
+                self._garbage += 1
+            self._set(record_id, record)
+        elif "del" in entry:
+            if self._remove(entry["del"]) is not None:
+                self._garbage += 1
+            self._garbage += 1
+
+    def _write_pending(self):
+        """Anexa las entradas acumuladas, después de las de otros procesos."""
+        entries, self._pending = self._pending, []
+        if _file_signature(self.filename) != self._signature:
+            self._sync_from_disk()
+            for entry in entries:
+                self._apply(entry)
+        self._append(entries)
+
+    def _append(self, entries):
+        """Anexa entradas a la bitácora y actualiza la posición leída."""
+        payload = "".join(
+            _dumps(entry) + "\n" for entry in entries
+        ).encode('utf-8')
+        try:
+            with open(self.filename, 'ab') as file:
+                file.write(payload)
+                _fsync(file)
+        except IOError as error:
+            print(f"Error al guardar en el archivo {self.filename}: {error}")
+            return
+        self._offset += len(payload)
+        self._signature = _file_signature(self.filename)
+        if self._garbage > max(self.COMPACT_MIN_ENTRIES, len(self._index)):
+            self.compact()
+
+    def compact(self):
+        """Reescribe la bitácora dejando una entrada por registro vivo."""
+        text = "".join(
+            _dumps({"put": record}) + "\n"
+            for record in self._index.values()
+        )
+        try:
+            _replace_file(self.filename, text)
+        except IOError as error:
+            print(f"Error al compactar el archivo {self.filename}: {error}")
+            return
+        self._garbage = 0
+        self._offset = len(text.encode('utf-8'))
+        self._signature = _file_signature(self.filename)
+
+    def put(self, record):
+        record = _copy(record)
+        record_id = self._key_of(record)
+        if record_id in self._index:
+            self._garbage += 1
+        self._set(record_id, record)
+        self._pending.append({"put": record})
+        self._mark_dirty()
+
+    def delete(self, record_id):
+        if self._remove(record_id) is None:
+            return False
+        self._garbage += 2
+        self._pending.append({"del": record_id})
+        self._mark_dirty()
+        return True
+
+    def replace_all(self, records):
+        self._reset()
+        for record in map(_copy, records):
+            self._set(self._key_of(record), record)
+        self._pending = []
+        self._dirty = False
+        self.compact()
+
+
+class SqliteTable(Table):
+    """
+    Tabla sobre un archivo SQLite con el ID como llave primaria.
+
+    La conexión se comparte entre hilos (``check_same_thread=False``); las
+    escrituras ya están serializadas por ``locked``, que también excluye a
+    los hilos del mismo proceso.
+
+    Las escrituras se confirman de inmediato e ignoran el intervalo de
+    ``set_flush_interval``: una transacción abierta bloquearía a las
+    demás conexiones. Solo ``batch()`` agrupa varias escrituras en una
+    transacción, que se confirma al salir del bloque.
+    """
+
+    def __init__(self, filename, key=None):
+        super().__init__(filename, key)
+        self._connection = None
+        self._inode = None
+        self._indexed_fields = set()
+        self._batch_depth = 0
+
+    def _mark_dirty(self):
+        """Confirma la escritura, salvo dentro de ``batch()``."""
+        self._dirty = True
+        if not self._batch_depth:
+            self.flush()
+
+    @contextmanager
+    def batch(self):
+        """Agrupa las escrituras del bloque en una sola transacción."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if not self._batch_depth:
+                self.flush()
+
+    def refresh(self):
+        """Reabre la conexión si el archivo fue reemplazado o eliminado."""
+        signature = _file_signature(self.filename)
+        inode = signature[0] if signature else None
+        if self._connection is not None and inode == self._inode:
+            return
+        if self._connection is not None:
+            self._connection.close()
+        self._connection = sqlite3.connect(self.filename,
+                                           check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS records "
+            "(id TEXT PRIMARY KEY, data TEXT NOT NULL)"
+        )
+        for field in self._indexed_fields:
+            self._create_index(field)
+        self._connection.commit()
+        self._inode = _file_signature(self.filename)[0]
+        if self.key is None:
+            row = self._connection.execute(
+                "SELECT data FROM records LIMIT 1").fetchone()
+            if row:
+                self.key = _infer_key(json.loads(row[0]))
+
+    def _create_index(self, field):
+        """Crea el índice SQL sobre el campo JSON ``field``."""
+        self._connection.execute(
+            f'CREATE INDEX IF NOT EXISTS "idx_{field}" '
+            f"ON records (json_extract(data, '$.{field}'))")
+
+    def add_index(self, field):
+        if not re.fullmatch(r"\w+", field) or field in self._indexed_fields:
+            return
+        self._indexed_fields.add(field)
+        if self._connection is not None:
+            with self._connection:
+                self._create_index(field)
+
+    def find(self, field, value):
+        if field not in self._indexed_fields:
+            return super().find(field, value)
+        rows = self._connection.execute(
+            f"SELECT data FROM records WHERE json_extract(data, '$.{field}') "
+            "= ? ORDER BY rowid", (value,))
+        return [json.loads(data) for (data,) in rows]
+
+    def records(self):
+        rows = self._connection.execute(
+            "SELECT data FROM records ORDER BY rowid")
+        return [json.loads(data) for (data,) in rows]
+
+    def get(self, record_id):
+        row = self._connection.execute(
+            "SELECT data FROM records WHERE id = ?",
+            (json.dumps(record_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _write_pending(self):
+        """Confirma la transacción abierta por las escrituras pendientes."""
+        self._connection.commit()
+
+    def put(self, record):
+        self._connection.execute(
+            "INSERT INTO records (id, data) VALUES (?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET data = excluded.data",
+            (json.dumps(self._key_of(record)), _dumps(record)))
+        self._mark_dirty()
+
+    def delete(self, record_id):
+        cursor = self._connection.execute(
+            "DELETE FROM records WHERE id = ?", (json.dumps(record_id),))
+        if cursor.rowcount == 0:
+            return False
+        self._mark_dirty()
+        return True
+
+    def replace_all(self, records):
+        with self._connection:
+            self._connection.execute("DELETE FROM records")
+            self._connection.executemany(
+                "INSERT OR REPLACE INTO records (id, data) VALUES (?, ?)",
+                [(json.dumps(self._key_of(record)), _dumps(record))
+                 for record in records])
+
+
+BACKENDS = {
+    ".json": JsonTable,
+    ".jsonl": LogTable,
+    ".log": LogTable,
+    ".db": SqliteTable,
+    ".sqlite": SqliteTable,
+    ".sqlite3": SqliteTable,
+}
+
+_TABLES = {}
+_FLUSH_INTERVAL = [0.0]
+
+
+def register_backend(extension, table_class):
+    """Asocia una extensión de archivo con una clase de tabla."""
+    BACKENDS[extension.lower()] = table_class
+
+
+def open_table(filename, key=None, indexes=()):
+    """
+    Retorna la tabla de ``filename`` sincronizada con el disco.
+
+    Las tablas se reutilizan entre llamadas, por lo que su índice en
+    memoria solo se reconstruye cuando el archivo cambió. ``indexes`` lista
+    los campos con índice secundario que deben mantenerse.
+    """
+    path = os.path.abspath(filename)
+    table = _TABLES.get(path)
+    if table is None:
+        extension = os.path.splitext(filename)[1].lower()
+        table = BACKENDS.get(extension, JsonTable)(filename, key)
+        _TABLES[path] = table
+    elif key is not None and table.key is None:
+        table.key = key
+    elif key is not None and table.key != key:
+        raise ValueError(f"La tabla {filename} usa la clave '{table.key}'.")
+    table.refresh()
+    for field in indexes:
+        table.add_index(field)
+    return table
+
+
+def set_flush_interval(seconds):
+    """
+    Define cada cuántos segundos se vuelcan las escrituras acumuladas.
+
+    0 (por defecto) escribe cada cambio de inmediato. Aplica a las tablas
+    ya abiertas y a las que se abran después.
+    """
+    _FLUSH_INTERVAL[0] = seconds
+    for table in _TABLES.values():
+        table.flush_interval = seconds
+    flush_all()
+
+
+def flush_all():
+    """Vuelca los cambios pendientes de las tablas con escrituras."""
+    for table in list(_TABLES.values()):
+        if not table._dirty:  # pylint: disable=protected-access
+            continue
+        try:
+            with locked(table.filename):
+                table.flush()
+        except OSError as error:
+            print(f"Error al guardar en el archivo {table.filename}: "
+                  f"{error}")
+
+
+atexit.register(flush_all)
+
+
+def iter_records(filename):
+    """
+    Lee registros en bloque de un archivo de intercambio.
+
+    Admite JSON Lines (``.jsonl``, leído línea por línea), MessagePack
+    (``.msgpack``, requiere el paquete ``msgpack``) y arreglos JSON.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == ".msgpack":
+        if msgpack is None:
+            raise ImportError("El formato .msgpack requiere 'msgpack'.")
+        with open(filename, 'rb') as file:
+            yield from msgpack.Unpacker(file, raw=False)
+    elif extension in (".jsonl", ".log"):
+        with open(filename, 'r', encoding='utf-8') as file:
+            for line in file:
+                if line.strip():
+                    yield json.loads(line)
+    else:
+        with open(filename, 'r', encoding='utf-8') as file:
+            yield from json.load(file)
+
+
+def write_records(records, filename):
+    """
+    Escribe registros en bloque (mismo formato que ``iter_records``)
+    sin construir el archivo completo en memoria. Retorna cuántos escribió.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    count = 0
+    if extension == ".msgpack":
+        if msgpack is None:
+            raise ImportError("El formato .msgpack requiere 'msgpack'.")
+        packer = msgpack.Packer()
+        with open(filename, 'wb', buffering=1 << 20) as file:
+            for record in records:
+                file.write(packer.pack(record))
+                count += 1
+        return count
+    lines = extension in (".jsonl", ".log")
+    with open(filename, 'w', encoding='utf-8', buffering=1 << 20) as file:
+        file.write("" if lines else "[")
+        for record in records:
+            if lines:
+                file.write(_dumps(record) + "\n")
+            else:
+                file.write(("," if count else "") + _dumps(record))
+            count += 1
+        file.write("" if lines else "]")
+    return count
+
+
+def import_json(source, filename, key=None):
+    """Importa un archivo JSON del formato original a otro motor."""
+    legacy = JsonTable(source, key)
+    legacy.refresh()
+    target = open_table(filename, key if key is not None else legacy.key)
+    target.replace_all(legacy.records())
+    return len(legacy.records())
+
+
+def sync_file(filename):
+    """Fuerza a disco un archivo de datos ya escrito y su directorio."""
+    if not os.path.exists(filename):
+        return
+    with open(filename, 'rb') as file:
+        os.fsync(file.fileno())
+    _fsync_directory(filename)
+
+
+def journal_op(table, record_id, before, after):
+    """
+    Describe un cambio de ``Journal``: el registro ``record_id`` de la
+    tabla pasa de ``before`` a ``after`` (None significa inexistente).
+    """
+    return {"file": table.filename, "key": table.key, "id": record_id,
+            "before": before, "after": after}
+
+
+class Journal:
+    """
+    Bitácora de intención (write-ahead) para transacciones entre archivos.
+
+    ``commit`` anexa todos los cambios de la transacción en una sola línea
+    con un fsync, que es el punto de confirmación; después los aplica a las
+    tablas. Con bitácoras ``.jsonl`` los anexos no hacen fsync, así que la
+    transacción cuesta un único fsync. Con el formato ``.json`` cada tabla
+    tocada se reescribe completa y su temporal se fuerza a disco, así que
+    una reserva sin fechas cuesta tres fsync (bitácora, hoteles y
+    reservaciones) y más E/S que sin la bitácora. Cada
+    ``checkpoint_interval`` transacciones (por defecto
+    ``CHECKPOINT_INTERVAL``) los archivos de datos se fuerzan a disco y la
+    bitácora se vacía.
+
+    Tras una caída, ``recover`` vuelve a aplicar cada cambio cuyo registro
+    sigue en su estado ``before``; si ya está en ``after`` o alguien lo
+    modificó después, se deja como está. Quien llama debe tener el candado
+    de todos los archivos involucrados.
+    """
+
+    CHECKPOINT_INTERVAL = 100
+
+    def __init__(self, filename, checkpoint_interval=None):
+        """Asocia la bitácora de intención con ``filename``."""
+        self.filename = filename
+        self.checkpoint_interval = (self.CHECKPOINT_INTERVAL
+                                    if checkpoint_interval is None
+                                    else checkpoint_interval)
+        self._pending = 0
+        self._dirty_files = set()
+
+    def commit(self, ops):
+        """Confirma y aplica una transacción (lista de ``journal_op``)."""
+        self._append(ops)
+        self._apply(ops)
+        self._pending += 1
+        if self._pending >= self.checkpoint_interval:
+            self.checkpoint()
+
+    def _append(self, ops):
+        """Escribe la transacción en la bitácora con un único fsync."""
+        line = _dumps({"ops": ops}) + "\n"
+        with open(self.filename, 'a', encoding='utf-8') as file:
+            file.write(line)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _apply(self, ops):
+        """Aplica los cambios de una transacción sin fsync por archivo."""
+        with deferred_sync(), ExitStack() as batches:
+            tables = {}
+            for op in ops:
+                table = tables.get(op["file"])
+                if table is None:
+                    table = open_table(op["file"], op["key"])
+                    batches.enter_context(table.batch())
+                    tables[op["file"]] = table
+                current = table.get(op["id"])
+                if current == op["after"] or current != op["before"]:
+                    continue
+                if op["after"] is None:
+                    table.delete(op["id"])
+                else:
+                    table.put(op["after"])
+                self._dirty_files.add(op["file"])
+
+    def recover(self):
+        """Reaplica las transacciones pendientes tras una caída."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        for line in lines:
+            if not line.endswith("\n"):
+                break  # Transacción interrumpida antes de confirmarse
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                print(f"Error: El archivo {self.filename} contiene datos "
+                      "inválidos.")
+                continue
+            ops = entry["ops"]
+            self._dirty_files.update(op["file"] for op in ops)
+            self._apply(ops)
+        self.checkpoint()
+
+    def checkpoint(self):
+        """Fuerza a disco los archivos modificados y vacía la bitácora."""
+        flush_all()
+        for filename in self._dirty_files:
+            sync_file(filename)
+        self._dirty_files.clear()
+        if os.path.exists(self.filename):
+            with open(self.filename, 'w', encoding='utf-8') as file:
+                os.fsync(file.fileno())
+        self._pending = 0
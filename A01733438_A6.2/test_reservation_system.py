@@ -5,11 +5,43 @@ Implementa casos de prueba para Hotel, Customer y Reservation,
 asegurando una cobertura superior al 85% y cumpliendo PEP-8.
 """
 
+import asyncio
+import contextlib
+import io
+import multiprocessing
+import random
+import sqlite3
+import tempfile
 import unittest
 import os
+from unittest import mock
+import storage
+from availability import SegmentTree
+from booking_server import BookingServer
+from load_client import BookingClient, run_load
 from reservation_system import (
-    Hotel, Customer, Reservation, load_data, save_data
+    Hotel, Customer, Reservation, ReservationService, load_data,
+    load_versioned_data, save_data
 )
+from storage import (
+    BACKENDS, LogTable, msgpack, flush_all, import_json, journal_op,
+    open_table, set_flush_interval
+)
+
+
+def remove_data_file(filename):
+    """Elimina un archivo de datos de prueba y su candado."""
+    for name in (filename, filename + ".lock"):
+        if os.path.exists(name):
+            os.remove(name)
+
+
+def reserve_rooms_worker(args):
+    """Proceso de la prueba de estrés: intenta varias reservas."""
+    filename, attempts = args
+    with contextlib.redirect_stdout(io.StringIO()):
+        return sum(Hotel.reserve_room("H1", filename)
+                   for _ in range(attempts))
 
 
 class TestDataAccess(unittest.TestCase):
@@ -21,8 +53,7 @@ class TestDataAccess(unittest.TestCase):
 
     def tearDown(self):
         """Limpia el archivo temporal después de cada prueba."""
-        if os.path.exists(self.test_file):
-            os.remove(self.test_file)
+        remove_data_file(self.test_file)
 
     def test_load_nonexistent_file(self):
         """Prueba la carga de un archivo que no existe."""
@@ -43,6 +74,31 @@ class TestDataAccess(unittest.TestCase):
         loaded_data = load_data(self.test_file)
         self.assertEqual(loaded_data, test_data)
 
+    def test_save_and_load_plain_values(self):
+        """Prueba que el formato JSON admite valores que no son registros."""
+        self.assertTrue(save_data([1, "dos", [3]], self.test_file))
+        self.assertEqual(load_data(self.test_file), [1, "dos", [3]])
+
+    def test_load_json_object(self):
+        """Prueba que un objeto JSON (no arreglo) se reporta inválido."""
+        with open(self.test_file, 'w', encoding='utf-8') as file:
+            file.write('{"a": 1}')
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            self.assertEqual(load_data(self.test_file), [])
+        self.assertIn("contiene datos inválidos", output.getvalue())
+
+    def test_save_invalid_records_to_log(self):
+        """Prueba que la bitácora rechaza registros sin ID."""
+        filename = "test_data.jsonl"
+        try:
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertFalse(save_data([1, 2], filename))
+                self.assertFalse(save_data({"a": 1}, filename))
+            self.assertEqual(load_data(filename), [])
+        finally:
+            remove_data_file(filename)
+
 
 class TestHotel(unittest.TestCase):
     """Pruebas unitarias para la clase Hotel."""
@@ -50,12 +106,10 @@ class TestHotel(unittest.TestCase):
     def setUp(self):
         self.file = "test_hotels.json"
         self.hotel = Hotel("H1", "Hotel Tequendama", "Bogotá", 2)
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def tearDown(self):
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def test_create_hotel(self):
         """Prueba la creación de hoteles y manejo de duplicados."""
@@ -87,6 +141,20 @@ class TestHotel(unittest.TestCase):
             Hotel.modify_hotel_info("H99", "name", "X", self.file)
         )
 
+    def test_modify_hotel_id_to_existing(self):
+        """Prueba que cambiar el ID por uno existente no pisa el registro."""
+        Hotel.create_hotel(self.hotel, self.file)
+        Hotel.create_hotel(Hotel("H2", "B", "Lima", 1), self.file)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertFalse(
+                Hotel.modify_hotel_info("H1", "hotel_id", "H2", self.file))
+        self.assertEqual(Hotel.display_hotel_info("H2", self.file)["name"],
+                         "B")
+        self.assertIsNotNone(Hotel.display_hotel_info("H1", self.file))
+        self.assertTrue(
+            Hotel.modify_hotel_info("H1", "hotel_id", "H3", self.file))
+        self.assertIsNone(Hotel.display_hotel_info("H1", self.file))
+
     def test_reserve_room(self):
         """Prueba la reserva de habitaciones y límite de disponibilidad."""
         Hotel.create_hotel(self.hotel, self.file)
@@ -108,12 +176,10 @@ class TestCustomer(unittest.TestCase):
     def setUp(self):
         self.file = "test_customers.json"
         self.customer = Customer("C1", "Daniel", "dan@test.com")
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def tearDown(self):
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def test_create_customer(self):
         """Prueba la creación de clientes."""
@@ -152,12 +218,10 @@ class TestReservation(unittest.TestCase):
     def setUp(self):
         self.file = "test_reservations.json"
         self.reservation = Reservation("R1", "C1", "H1")
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def tearDown(self):
-        if os.path.exists(self.file):
-            os.remove(self.file)
+        remove_data_file(self.file)
 
     def test_create_reservation(self):
         """Prueba la creación de reservaciones."""
@@ -179,5 +243,794 @@ class TestReservation(unittest.TestCase):
         )
 
 
+class TestStorageBackends(unittest.TestCase):
+    """Pruebas para los motores de bitácora y SQLite."""
+
+    def setUp(self):
+        self.files = ["test_hotels.jsonl", "test_hotels.db",
+                      "test_legacy.json"]
+        self.tearDown()
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def check_hotel_operations(self, filename):
+        """Ejecuta el ciclo de vida de un hotel sobre un motor dado."""
+        hotel = Hotel("H1", "Hotel Tequendama", "Bogotá", 1)
+        self.assertTrue(Hotel.create_hotel(hotel, filename))
+        self.assertFalse(Hotel.create_hotel(hotel, filename))
+        self.assertTrue(Hotel.reserve_room("H1", filename))
+        self.assertFalse(Hotel.reserve_room("H1", filename))
+        self.assertTrue(
+            Hotel.modify_hotel_info("H1", "name", "Nuevo", filename)
+        )
+        self.assertEqual(
+            Hotel.display_hotel_info("H1", filename)["name"], "Nuevo"
+        )
+        self.assertTrue(Hotel.delete_hotel("H1", filename))
+        self.assertEqual(load_data(filename), [])
+
+    def test_log_backend(self):
+        """Prueba las operaciones de hotel sobre la bitácora."""
+        self.check_hotel_operations("test_hotels.jsonl")
+
+    def test_sqlite_backend(self):
+        """Prueba las operaciones de hotel sobre SQLite."""
+        self.check_hotel_operations("test_hotels.db")
+
+    def test_log_compaction(self):
+        """Prueba que la bitácora se compacta conservando los datos."""
+        table = open_table("test_hotels.jsonl", "hotel_id")
+        for count in range(LogTable.COMPACT_MIN_ENTRIES + 10):
+            table.put({"hotel_id": "H1", "rooms_available": count})
+        with open("test_hotels.jsonl", 'r', encoding='utf-8') as file:
+            lines = file.readlines()
+        self.assertLess(len(lines), LogTable.COMPACT_MIN_ENTRIES)
+        self.assertEqual(
+            table.get("H1")["rooms_available"],
+            LogTable.COMPACT_MIN_ENTRIES + 9
+        )
+
+    def test_log_sees_external_appends(self):
+        """Prueba que la bitácora relee solo lo anexado por otro escritor."""
+        table = open_table("test_hotels.jsonl", "hotel_id")
+        table.put({"hotel_id": "H1", "rooms_available": 1})
+        with open("test_hotels.jsonl", 'a', encoding='utf-8') as file:
+            file.write('{"put": {"hotel_id": "H2", "rooms_available": 2}}\n')
+        table = open_table("test_hotels.jsonl", "hotel_id")
+        self.assertEqual(table.get("H2")["rooms_available"], 2)
+
+    def test_import_json(self):
+        """Prueba la importación de un archivo JSON original."""
+        save_data([{"hotel_id": "H1", "name": "A"},
+                   {"hotel_id": "H2", "name": "B"}], "test_legacy.json")
+        self.assertEqual(import_json("test_legacy.json", "test_hotels.db"), 2)
+        self.assertEqual(load_data("test_hotels.db"),
+                         load_data("test_legacy.json"))
+
+
+class TestConcurrency(unittest.TestCase):
+    """Pruebas de escrituras atómicas y reservas concurrentes."""
+
+    def setUp(self):
+        self.files = ["test_stress.json", "test_stress.jsonl"]
+        self.tearDown()
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_optimistic_version_check(self):
+        """Prueba que una versión obsoleta no sobrescribe cambios."""
+        save_data([{"hotel_id": "H1", "rooms_available": 1}],
+                  "test_stress.json")
+        data, version = load_versioned_data("test_stress.json")
+        self.assertTrue(Hotel.reserve_room("H1", "test_stress.json"))
+        self.assertFalse(save_data(data, "test_stress.json", version))
+        _, version = load_versioned_data("test_stress.json")
+        self.assertTrue(save_data(data, "test_stress.json", version))
+
+    def test_save_leaves_no_temporary_files(self):
+        """Prueba que el guardado atómico no deja archivos temporales."""
+        save_data([{"hotel_id": "H1"}], "test_stress.json")
+        leftovers = [name for name in os.listdir('.')
+                     if name.startswith("test_stress.json.tmp")]
+        self.assertEqual(leftovers, [])
+
+    def check_no_overselling(self, filename):
+        """Cientos de reservas concurrentes no exceden las habitaciones."""
+        rooms, workers, attempts = 50, 8, 40
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", rooms), filename)
+        with multiprocessing.Pool(workers) as pool:
+            booked = sum(pool.map(reserve_rooms_worker,
+                                  [(filename, attempts)] * workers))
+        self.assertEqual(booked, rooms)
+        with contextlib.redirect_stdout(io.StringIO()):
+            hotel = Hotel.display_hotel_info("H1", filename)
+        self.assertEqual(hotel["rooms_available"], 0)
+
+    def test_no_overselling_json(self):
+        """Prueba de estrés multiproceso sobre el formato JSON."""
+        self.check_no_overselling("test_stress.json")
+
+    def test_no_overselling_log(self):
+        """Prueba de estrés multiproceso sobre la bitácora."""
+        self.check_no_overselling("test_stress.jsonl")
+
+    def test_locked_uses_msvcrt_without_fcntl(self):
+        """Prueba el candado de Windows (msvcrt) cuando no hay fcntl."""
+        fake = mock.Mock(LK_LOCK=2, LK_UNLCK=0)
+        fake.locking.side_effect = [OSError("ocupado"), None, None]
+        with mock.patch.object(storage, "fcntl", None), \
+                mock.patch.object(storage, "msvcrt", fake):
+            with storage.locked("test_stress.json"):
+                pass
+        self.assertEqual(
+            [call.args[1:] for call in fake.locking.call_args_list],
+            [(2, 1), (2, 1), (0, 1)])
+
+    def test_locked_fails_without_lock_support(self):
+        """Prueba que sin fcntl ni msvcrt el candado falla en voz alta."""
+        with mock.patch.object(storage, "fcntl", None), \
+                mock.patch.object(storage, "msvcrt", None):
+            with self.assertRaises(OSError):
+                with storage.locked("test_stress.json"):
+                    pass
+
+
+class TestRepositoryCache(unittest.TestCase):
+    """Pruebas de la caché en memoria y la escritura diferida."""
+
+    def setUp(self):
+        self.files = ["test_cache.json", "test_cache.jsonl", "test_cache.db"]
+        self.tearDown()
+
+    def tearDown(self):
+        set_flush_interval(0)
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_reads_do_not_reparse(self):
+        """Prueba que las lecturas repetidas no vuelven a parsear."""
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 3),
+                           "test_cache.json")
+        with mock.patch("storage.json.load") as json_load:
+            for _ in range(5):
+                self.assertIsNotNone(
+                    open_table("test_cache.json", "hotel_id").get("H1"))
+        json_load.assert_not_called()
+
+    def test_external_change_invalidates(self):
+        """Prueba que un cambio externo en el archivo se detecta."""
+        table = open_table("test_cache.json", "hotel_id")
+        table.put({"hotel_id": "H1", "rooms_available": 1})
+        with open("test_cache.json", 'w', encoding='utf-8') as file:
+            file.write('[{"hotel_id": "H2", "rooms_available": 2}]')
+        table = open_table("test_cache.json", "hotel_id")
+        self.assertIsNone(table.get("H1"))
+        self.assertEqual(table.get("H2")["rooms_available"], 2)
+
+    def test_reads_return_copies(self):
+        """Prueba que editar lo leído sin guardar no altera la caché."""
+        for filename in self.files:
+            with self.subTest(filename=filename):
+                Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 5),
+                                   filename)
+                load_data(filename)[0]["rooms_available"] = 0
+                Hotel.find_available("Bogotá", filename)[0]["location"] = "X"
+                open_table(filename, "hotel_id").get("H1")["name"] = "Otro"
+                hotel = Hotel("H2", "Hotel", "Lima", 1)
+                record = hotel.to_dict()
+                open_table(filename, "hotel_id").put(record)
+                record["rooms_available"] = 9
+                self.assertEqual(Hotel.find_available("Bogotá", filename),
+                                 [Hotel("H1", "Hotel", "Bogotá",
+                                        5).to_dict()])
+                on_disk = BACKENDS[os.path.splitext(filename)[1]](filename)
+                on_disk.refresh()
+                self.assertEqual(on_disk.get("H1")["rooms_available"], 5)
+                self.assertEqual(on_disk.get("H2")["rooms_available"], 1)
+
+    def check_write_back(self, filename):
+        """Prueba que las escrituras se acumulan hasta el volcado."""
+        set_flush_interval(3600)
+        for number in range(10):
+            Hotel.create_hotel(Hotel(f"H{number}", "Hotel", "Bogotá", 1),
+                               filename)
+        self.assertFalse(os.path.exists(filename))
+        self.assertEqual(len(load_data(filename)), 10)
+        flush_all()
+        self.assertTrue(os.path.exists(filename))
+        on_disk = BACKENDS[os.path.splitext(filename)[1]](filename)
+        on_disk.refresh()
+        self.assertEqual(len(on_disk.records()), 10)
+
+    def test_write_back_json(self):
+        """Prueba la escritura diferida en el formato JSON."""
+        self.check_write_back("test_cache.json")
+
+    def test_write_back_log(self):
+        """Prueba la escritura diferida en la bitácora."""
+        self.check_write_back("test_cache.jsonl")
+
+    def test_sqlite_is_write_through(self):
+        """Prueba que SQLite confirma aunque haya intervalo de volcado."""
+        set_flush_interval(3600)
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 1),
+                           "test_cache.db")
+        other = sqlite3.connect("test_cache.db", timeout=0.1)
+        try:
+            self.assertEqual(other.execute(
+                "SELECT COUNT(*) FROM records").fetchone()[0], 1)
+            with other:
+                other.execute("DELETE FROM records")
+        finally:
+            other.close()
+
+    def test_flush_all_skips_clean_tables(self):
+        """Prueba que flush_all no crea candados de tablas sin cambios."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            Hotel.display_hotel_info("ZZ", "test_cache_readonly.json")
+        flush_all()
+        self.assertFalse(os.path.exists("test_cache_readonly.json.lock"))
+
+
+class TestReservationService(unittest.TestCase):
+    """Pruebas para las reservas transaccionales."""
+
+    def setUp(self):
+        self.files = ["test_svc_hotels.json", "test_svc_customers.json",
+                      "test_svc_reservations.json",
+                      "test_svc_reservations.json.journal"]
+        self.tearDown()
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 1),
+                           self.files[0])
+        Customer.create_customer(Customer("C1", "Daniel", "d@test.com"),
+                                 self.files[1])
+        self.service = ReservationService(*self.files[:3])
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def rooms(self):
+        """Retorna las habitaciones disponibles del hotel de prueba."""
+        return open_table(self.files[0], "hotel_id").get(
+            "H1")["rooms_available"]
+
+    def test_book_and_cancel(self):
+        """Prueba que reservar y cancelar actualizan ambos archivos."""
+        self.assertTrue(self.service.book(Reservation("R1", "C1", "H1")))
+        self.assertEqual(self.rooms(), 0)
+        self.assertEqual(len(load_data(self.files[2])), 1)
+        self.assertTrue(self.service.cancel("R1"))
+        self.assertEqual(self.rooms(), 1)
+        self.assertEqual(load_data(self.files[2]), [])
+        self.assertFalse(self.service.cancel("R1"))
+
+    def test_book_validations(self):
+        """Prueba los rechazos por cliente, hotel, duplicado y cupo."""
+        self.assertFalse(self.service.book(Reservation("R1", "C9", "H1")))
+        self.assertFalse(self.service.book(Reservation("R1", "C1", "H9")))
+        self.assertTrue(self.service.book(Reservation("R1", "C1", "H1")))
+        self.assertFalse(self.service.book(Reservation("R1", "C1", "H1")))
+        self.assertFalse(self.service.book(Reservation("R2", "C1", "H1")))
+        self.assertEqual(len(load_data(self.files[2])), 1)
+
+    def test_book_fsyncs_replaced_files(self):
+        """Prueba que los archivos JSON reescritos se fuerzan a disco."""
+        with mock.patch("storage.os.fsync") as fsync:
+            self.assertTrue(self.service.book(Reservation("R1", "C1", "H1")))
+        # Bitácora de intención, hoteles y reservaciones
+        self.assertEqual(fsync.call_count, 3)
+
+    def test_book_log_uses_single_fsync(self):
+        """Prueba que con bitácoras .jsonl una reserva hace un fsync."""
+        files = ["test_svc_hotels.jsonl", "test_svc_customers.jsonl",
+                 "test_svc_reservations.jsonl",
+                 "test_svc_reservations.jsonl.journal"]
+        self.files += files
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 1), files[0])
+        Customer.create_customer(Customer("C1", "Daniel", "d@test.com"),
+                                 files[1])
+        service = ReservationService(*files[:3])
+        with mock.patch("storage.os.fsync") as fsync:
+            self.assertTrue(service.book(Reservation("R1", "C1", "H1")))
+        self.assertEqual(fsync.call_count, 1)
+
+    def test_recover_after_crash(self):
+        """Prueba que una transacción confirmada se aplica al recuperar."""
+        hotels = open_table(self.files[0], "hotel_id")
+        reservations = open_table(self.files[2], "reservation_id")
+        hotel = hotels.get("H1")
+        record = Reservation("R1", "C1", "H1").to_dict()
+        # Simula una caída justo después de confirmar en la bitácora
+        self.service.journal._append([
+            journal_op(hotels, "H1", hotel,
+                       dict(hotel, rooms_available=0)),
+            journal_op(reservations, "R1", None, record),
+        ])
+        ReservationService(*self.files[:3])
+        self.assertEqual(self.rooms(), 0)
+        self.assertEqual(load_data(self.files[2]), [record])
+        self.assertEqual(os.path.getsize(self.files[3]), 0)
+
+    def test_recover_skips_newer_changes(self):
+        """Prueba que la recuperación no pisa cambios posteriores."""
+        hotels = open_table(self.files[0], "hotel_id")
+        hotel = hotels.get("H1")
+        self.service.journal._append([
+            journal_op(hotels, "H1", hotel, dict(hotel, rooms_available=0))
+        ])
+        Hotel.modify_hotel_info("H1", "rooms_available", 7, self.files[0])
+        ReservationService(*self.files[:3])
+        self.assertEqual(self.rooms(), 7)
+
+
+class TestAvailability(unittest.TestCase):
+    """Pruebas del índice de disponibilidad por fechas."""
+
+    def setUp(self):
+        self.files = ["test_av_hotels.json", "test_av_customers.json",
+                      "test_av_reservations.json",
+                      "test_av_reservations.json.journal"]
+        self.tearDown()
+        Hotel.create_hotel(Hotel("H1", "Hotel", "Bogotá", 1),
+                           self.files[0])
+        Customer.create_customer(Customer("C1", "Daniel", "d@test.com"),
+                                 self.files[1])
+        self.service = ReservationService(*self.files[:3])
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_segment_tree_matches_brute_force(self):
+        """Prueba sumas y mínimos en rango contra una lista simple."""
+        rng = random.Random(7)
+        values = [rng.randint(0, 9) for _ in range(50)]
+        tree = SegmentTree(50)
+        for pos, value in enumerate(values):
+            tree.add(pos, pos, value)
+        for _ in range(300):
+            first = rng.randrange(50)
+            last = rng.randrange(first, 50)
+            if rng.random() < 0.5:
+                delta = rng.randint(-3, 3)
+                tree.add(first, last, delta)
+                for pos in range(first, last + 1):
+                    values[pos] += delta
+            else:
+                self.assertEqual(tree.minimum(first, last),
+                                 min(values[first:last + 1]))
+        self.assertEqual(tree.values(), values)
+
+    def test_segment_tree_grows(self):
+        """Prueba que el árbol crece hacia ambos lados sin perder valores."""
+        rng = random.Random(11)
+        tree = SegmentTree()
+        values = {}
+        for _ in range(300):
+            first = rng.randrange(-5000, 5000)
+            last = first + rng.randrange(40)
+            if rng.random() < 0.5:
+                delta = rng.randint(-3, 3)
+                tree.add(first, last, delta)
+                for pos in range(first, last + 1):
+                    values[pos] = values.get(pos, 0) + delta
+            else:
+                self.assertEqual(
+                    tree.minimum(first, last),
+                    min(values.get(pos, 0) for pos in range(first, last + 1)))
+        self.assertLessEqual(tree.size, 32768)
+
+    def test_overlapping_date_bookings(self):
+        """Prueba que solo las noches ocupadas bloquean el cupo."""
+        book = self.service.book
+        self.assertTrue(
+            book(Reservation("R1", "C1", "H1", "2030-01-03", "2030-01-07")))
+        self.assertFalse(
+            self.service.is_available("H1", "2030-01-05", "2030-01-08"))
+        self.assertFalse(
+            book(Reservation("R2", "C1", "H1", "2030-01-05", "2030-01-08")))
+        self.assertTrue(
+            book(Reservation("R3", "C1", "H1", "2030-01-07", "2030-01-09")))
+        self.assertTrue(
+            book(Reservation("R4", "C1", "H1", "2029-12-30", "2030-01-03")))
+        self.assertEqual(open_table(self.files[0], "hotel_id").get(
+            "H1")["rooms_available"], 1)
+        self.assertTrue(self.service.cancel("R1"))
+        self.assertEqual(
+            self.service.free_rooms("H1", "2030-01-03", "2030-01-07"), 1)
+
+    def test_index_rebuilt_from_reservations(self):
+        """Prueba que un servicio nuevo reconstruye el índice del archivo."""
+        self.service.book(
+            Reservation("R1", "C1", "H1", "2030-01-03", "2030-01-07"))
+        service = ReservationService(*self.files[:3])
+        self.assertEqual(service.free_rooms("H1", "2030-01-06", "2031-06-01"),
+                         0)
+        self.assertEqual(service.free_rooms("H1", "2030-01-07", "2031-06-01"),
+                         1)
+
+    def test_invalid_dates(self):
+        """Prueba rangos vacíos y hoteles inexistentes."""
+        self.assertFalse(self.service.book(
+            Reservation("R1", "C1", "H1", "2030-01-07", "2030-01-03")))
+        self.assertIsNone(
+            self.service.free_rooms("H1", "2030-01-07", "2030-01-07"))
+        self.assertIsNone(
+            self.service.free_rooms("H9", "2030-01-03", "2030-01-07"))
+
+    def test_reservation_requires_both_dates(self):
+        """Prueba que una sola fecha se rechaza al crear la reservación."""
+        with self.assertRaises(ValueError):
+            Reservation("R1", "C1", "H1", "2030-01-03")
+        with self.assertRaises(ValueError):
+            Reservation("R1", "C1", "H1", None, "2030-01-03")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertIsNone(
+                self.service.free_rooms("H1", None, "2030-01-03"))
+
+    def test_failed_commit_keeps_availability(self):
+        """Prueba que una transacción fallida no deja noches ocupadas."""
+        dates = ("2030-01-03", "2030-01-07")
+        with mock.patch.object(self.service.journal, "commit",
+                               side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                self.service.book(Reservation("R1", "C1", "H1", *dates))
+        self.assertEqual(self.service.free_rooms("H1", *dates), 1)
+        self.assertTrue(
+            self.service.book(Reservation("R1", "C1", "H1", *dates)))
+        with mock.patch.object(self.service.journal, "commit",
+                               side_effect=OSError("disco lleno")):
+            with self.assertRaises(OSError):
+                self.service.cancel("R1")
+        self.assertEqual(self.service.free_rooms("H1", *dates), 0)
+
+    def test_dates_far_apart(self):
+        """Prueba que reservas antiguas o lejanas no limitan las demás."""
+        Reservation.create_reservation(
+            Reservation("R0", "C1", "H1", "2016-05-01", "2016-05-03"),
+            self.files[2])
+        book = self.service.book
+        for number, check_in, check_out in (
+                (1, "2026-01-01", "2026-01-02"),
+                (2, "2400-01-01", "2400-01-02"),
+                (3, "0001-01-01", "0001-01-02"),
+                (4, "9999-12-30", "9999-12-31")):
+            self.assertTrue(book(
+                Reservation(f"R{number}", "C1", "H1", check_in, check_out)))
+        service = ReservationService(*self.files[:3])
+        self.assertEqual(
+            service.free_rooms("H1", "2016-05-02", "2016-05-03"), 0)
+        self.assertEqual(
+            service.free_rooms("H1", "2016-05-03", "2026-01-01"), 1)
+        self.assertEqual(
+            service.free_rooms("H1", "2400-01-01", "2400-01-02"), 0)
+
+class TestQueries(unittest.TestCase):
+    """Pruebas de los índices secundarios y consultas."""
+
+    def setUp(self):
+        self.files = ["test_q_hotels.json", "test_q_reservations.jsonl",
+                      "test_q_reservations.db"]
+        self.tearDown()
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_find_available_by_location(self):
+        """Prueba hoteles con cupo por ubicación tras modificaciones."""
+        hotels = self.files[0]
+        Hotel.create_hotel(Hotel("H1", "A", "Bogotá", 1), hotels)
+        Hotel.create_hotel(Hotel("H2", "B", "Bogotá", 0), hotels)
+        Hotel.create_hotel(Hotel("H3", "C", "Medellín", 4), hotels)
+        self.assertEqual(
+            [h["hotel_id"] for h in Hotel.find_available("Bogotá", hotels)],
+            ["H1"])
+        Hotel.modify_hotel_info("H3", "location", "Bogotá", hotels)
+        Hotel.reserve_room("H1", hotels)
+        self.assertEqual(
+            [h["hotel_id"] for h in Hotel.find_available("Bogotá", hotels)],
+            ["H3"])
+        self.assertEqual(Hotel.find_available("Medellín", hotels), [])
+
+    def check_reservation_queries(self, filename):
+        """Prueba las consultas por cliente y hotel en un motor."""
+        for number, (customer, hotel) in enumerate(
+                [("C1", "H1"), ("C1", "H2"), ("C2", "H1")]):
+            Reservation.create_reservation(
+                Reservation(f"R{number}", customer, hotel), filename)
+        self.assertEqual(
+            [r["reservation_id"]
+             for r in Reservation.find_by_customer("C1", filename)],
+            ["R0", "R1"])
+        Reservation.cancel_reservation("R0", filename)
+        self.assertEqual(
+            [r["reservation_id"]
+             for r in Reservation.find_by_hotel("H1", filename)],
+            ["R2"])
+        self.assertEqual(Reservation.find_by_customer("C9", filename), [])
+
+    def test_reservation_queries_log(self):
+        """Prueba las consultas sobre la bitácora."""
+        self.check_reservation_queries(self.files[1])
+
+    def test_reservation_queries_sqlite(self):
+        """Prueba las consultas sobre SQLite."""
+        self.check_reservation_queries(self.files[2])
+
+
+class TestBulkRecords(unittest.TestCase):
+    """Pruebas de los registros compactos y la carga en bloque."""
+
+    def setUp(self):
+        self.files = ["test_bulk.jsonl", "test_bulk.json",
+                      "test_bulk.msgpack"]
+        self.tearDown()
+        self.reservations = [
+            Reservation(f"R{number}", "C1", "H1") for number in range(50)
+        ] + [Reservation("R99", "C2", "H2", "2030-01-03", "2030-01-07")]
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_records_have_no_instance_dict(self):
+        """Prueba que las entidades usan __slots__."""
+        for record in (Hotel("H1", "A", "B", 1), Customer("C1", "A", "B"),
+                       self.reservations[0]):
+            self.assertFalse(hasattr(record, "__dict__"))
+
+    def check_round_trip(self, filename):
+        """Exporta e importa las reservaciones en un formato."""
+        self.assertEqual(
+            Reservation.export_many(self.reservations, filename), 51)
+        loaded = Reservation.import_many(filename)
+        self.assertEqual([r.to_dict() for r in loaded],
+                         [r.to_dict() for r in self.reservations])
+
+    def test_round_trip_json_lines(self):
+        """Prueba el formato JSON Lines."""
+        self.check_round_trip(self.files[0])
+
+    def test_round_trip_json(self):
+        """Prueba el formato JSON compacto."""
+        self.check_round_trip(self.files[1])
+        with open(self.files[1], 'r', encoding='utf-8') as file:
+            self.assertNotIn("\n", file.read())
+
+    @unittest.skipIf(msgpack is None, "Requiere msgpack")
+    def test_round_trip_msgpack(self):
+        """Prueba el formato binario MessagePack."""
+        self.check_round_trip(self.files[2])
+
+    def test_import_missing_file(self):
+        """Prueba la importación de un archivo inexistente."""
+        self.assertEqual(Customer.import_many("no_existe.jsonl"), [])
+
+
+class TestBatchOperations(unittest.TestCase):
+    """Pruebas de las operaciones en lote."""
+
+    def setUp(self):
+        self.files = ["test_batch_hotels.json", "test_batch_customers.json",
+                      "test_batch_reservations.json",
+                      "test_batch_reservations.json.journal"]
+        self.tearDown()
+
+    def tearDown(self):
+        for name in self.files:
+            remove_data_file(name)
+
+    def test_create_many_single_write(self):
+        """Prueba la creación en lote con duplicados y una escritura."""
+        Hotel.create_hotel(Hotel("H0", "A", "Bogotá", 1), self.files[0])
+        hotels = [Hotel(f"H{number}", "A", "Bogotá", 1)
+                  for number in range(5)] + [Hotel("H1", "B", "Cali", 1)]
+        with mock.patch("storage._replace_file",
+                        wraps=storage._replace_file) as write:
+            results = Hotel.create_many(hotels, self.files[0])
+        self.assertEqual(write.call_count, 1)
+        self.assertEqual([result.ok for result in results],
+                         [False, True, True, True, True, False])
+        self.assertEqual(len(load_data(self.files[0])), 5)
+
+    def test_delete_and_modify_many(self):
+        """Prueba la eliminación y modificación en lote."""
+        Customer.create_many([Customer(f"C{number}", "A", "a@test.com")
+                              for number in range(3)], self.files[1])
+        results = Customer.modify_many(
+            [("C0", "name", "Ana"), ("C1", "falso", "X"),
+             ("C9", "name", "X"), ("C2", "customer_id", "C0")],
+            self.files[1])
+        self.assertEqual([result.ok for result in results],
+                         [True, False, False, False])
+        self.assertEqual(results[1].error, "La propiedad 'falso' no existe.")
+        self.assertEqual(results[3].error, "El ID C0 ya existe.")
+        results = Customer.delete_many(["C1", "C9"], self.files[1])
+        self.assertEqual([result.ok for result in results], [True, False])
+        self.assertEqual(
+            [c["name"] for c in load_data(self.files[1])], ["Ana", "A"])
+
+    def test_book_many(self):
+        """Prueba reservas en lote con cupo limitado y un fsync por archivo."""
+        Hotel.create_hotel(Hotel("H1", "A", "Bogotá", 2), self.files[0])
+        Customer.create_customer(Customer("C1", "A", "a@test.com"),
+                                 self.files[1])
+        service = ReservationService(*self.files[:3])
+        batch = [Reservation(f"R{number}", "C1", "H1")
+                 for number in range(3)]
+        batch += [Reservation("R0", "C1", "H1"),
+                  Reservation("R9", "C9", "H1")]
+        with mock.patch("storage.os.fsync") as fsync:
+            results = service.book_many(batch)
+        # Bitácora de intención, hoteles y reservaciones
+        self.assertEqual(fsync.call_count, 3)
+        self.assertEqual([result.ok for result in results],
+                         [True, True, False, False, False])
+        self.assertEqual(results[2].error, "No hay habitaciones disponibles.")
+        self.assertEqual(len(load_data(self.files[2])), 2)
+        self.assertEqual(
+            load_data(self.files[0])[0]["rooms_available"], 0)
+
+
+class TestBookingServer(unittest.IsolatedAsyncioTestCase):
+    """Pruebas del servicio asíncrono y su cliente de carga."""
+
+    EXTENSION = ".json"
+
+    async def asyncSetUp(self):
+        self.files = [f"test_srv_{name}{self.EXTENSION}"
+                      for name in ("hotels", "customers", "reservations")]
+        self.files.append(self.files[2] + ".journal")
+        self.remove_files()
+        # Datos creados en el hilo principal, antes que el hilo escritor
+        Hotel.create_hotel(Hotel("H0", "Previo", "Lima", 1), self.files[0])
+        Customer.create_customer(Customer("C0", "Previo", "p@test.com"),
+                                 self.files[1])
+        self.server = BookingServer(ReservationService(*self.files[:3]))
+        self.port = await self.server.start(port=0)
+        self.client = await BookingClient.connect(port=self.port)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        await self.server.close()
+        self.remove_files()
+
+    def remove_files(self):
+        """Elimina los archivos de datos de la prueba."""
+        for name in self.files:
+            remove_data_file(name)
+
+    async def test_book_through_server(self):
+        """Prueba alta, reserva, consulta y cancelación por TCP."""
+        call = self.client.call
+        self.assertTrue((await call(
+            "create_hotel", hotel_id="H1", name="A", location="Bogotá",
+            rooms_available=1))["ok"])
+        self.assertTrue((await call(
+            "create_customer", customer_id="C1", name="A",
+            email="a@test.com"))["ok"])
+        self.assertTrue((await call(
+            "book", reservation_id="R1", customer_id="C1",
+            hotel_id="H1"))["ok"])
+        response = await call("book", reservation_id="R2",
+                              customer_id="C1", hotel_id="H1")
+        self.assertEqual(response["error"], "No hay habitaciones disponibles.")
+        response = await call("get_hotel", hotel_id="H1")
+        self.assertEqual(response["result"]["rooms_available"], 0)
+        response = await call("customer_reservations", customer_id="C1")
+        self.assertEqual(len(response["result"]), 1)
+        self.assertTrue((await call("cancel", reservation_id="R1"))["ok"])
+
+    async def test_book_preexisting_records(self):
+        """Prueba reservar sobre datos creados fuera del servidor."""
+        call = self.client.call
+        self.assertTrue((await call("book", reservation_id="R0",
+                                    customer_id="C0", hotel_id="H0"))["ok"])
+        response = await call("get_customer", customer_id="C0")
+        self.assertEqual(response["result"]["name"], "Previo")
+
+    async def test_invalid_requests(self):
+        """Prueba operaciones desconocidas y argumentos faltantes."""
+        self.assertFalse((await self.client.call("borrar_todo"))["ok"])
+        self.assertFalse((await self.client.call("get_hotel"))["ok"])
+        self.assertFalse((await self.client.call("book"))["ok"])
+        response = await self.client.call(["x"])
+        self.assertEqual(response["error"], "Solicitud inválida.")
+        self.assertTrue(
+            (await self.client.call("get_customer", customer_id="C0"))["ok"])
+
+    async def test_invalid_ids_keep_writer_alive(self):
+        """Prueba que IDs no escalares o fallos internos no lo detienen."""
+        call = self.client.call
+        response = await asyncio.wait_for(
+            call("book", reservation_id="R1", customer_id=["x"],
+                 hotel_id="H0"), timeout=5)
+        self.assertEqual(response["error"], "Argumentos inválidos.")
+        self.assertFalse((await call("book", reservation_id="R1",
+                                     customer_id="C0", hotel_id="H0",
+                                     check_in=[1]))["ok"])
+        with mock.patch.object(self.server.service, "book_many",
+                               side_effect=RuntimeError("falla")):
+            response = await call("book", reservation_id="R1",
+                                  customer_id="C0", hotel_id="H0")
+        self.assertEqual(response["error"], "Error interno: falla")
+        response = await asyncio.wait_for(
+            call("get_customer", customer_id="C0"), timeout=5)
+        self.assertTrue(response["ok"])
+
+    async def test_failing_item_does_not_fail_group(self):
+        """Prueba fechas incompletas y un fallo aislado dentro del grupo."""
+        response = await self.client.call(
+            "book", reservation_id="R1", customer_id="C0", hotel_id="H0",
+            check_in="2030-01-01")
+        self.assertEqual(response["error"], "Argumentos inválidos.")
+        book_many = self.server.service.book_many
+
+        def flaky(items):
+            if any(item.reservation_id == "RX" for item in items):
+                raise RuntimeError("falla")
+            return book_many(items)
+
+        other = await BookingClient.connect(port=self.port)
+        try:
+            with mock.patch.object(self.server.service, "book_many",
+                                   side_effect=flaky):
+                bad, good = await asyncio.gather(
+                    other.call("book", reservation_id="RX",
+                               customer_id="C0", hotel_id="H0",
+                               check_in="2030-01-01",
+                               check_out="2030-01-03"),
+                    self.client.call("book", reservation_id="R2",
+                                     customer_id="C0", hotel_id="H0",
+                                     check_in="2030-01-05",
+                                     check_out="2030-01-07"))
+        finally:
+            await other.close()
+        self.assertEqual(bad["error"], "Error interno: falla")
+        self.assertTrue(good["ok"])
+        response = await self.client.call(
+            "free_rooms", hotel_id="H0", check_in="2030-01-01",
+            check_out="2030-01-03")
+        self.assertEqual(response["result"], 1)
+
+    async def test_load_refuses_default_data(self):
+        """Prueba que la carga no corre sobre los archivos por defecto."""
+        self.assertFalse(
+            (await self.client.call("info"))["result"]["default_data"])
+        previous_dir = os.getcwd()
+        with tempfile.TemporaryDirectory() as workdir:
+            os.chdir(workdir)
+            server = BookingServer(ReservationService())
+            try:
+                port = await server.start(port=0)
+                with self.assertRaises(ValueError):
+                    await run_load(port, connections=1, bookings=1)
+                self.assertFalse(os.path.exists("hotels.json"))
+            finally:
+                await server.close()
+                os.chdir(previous_dir)
+
+    async def test_group_commit_under_load(self):
+        """Prueba que las reservas concurrentes se confirman en grupos."""
+        with contextlib.redirect_stdout(io.StringIO()):
+            metrics = await run_load(self.port, connections=20, bookings=5)
+        self.assertEqual(metrics["bookings"], 100)
+        self.assertEqual(metrics["failures"], 0)
+        self.assertLess(self.server.groups_committed, 100)
+        self.assertGreater(metrics["p99_ms"], 0)
+
+
+class TestBookingServerSqlite(TestBookingServer):
+    """Las mismas pruebas del servicio sobre archivos SQLite."""
+
+    EXTENSION = ".db"
+
+
 if __name__ == '__main__':
     unittest.main()
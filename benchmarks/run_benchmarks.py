@@ -0,0 +1,362 @@
+"""
+Suite de benchmarks para todos los programas del repositorio.
+
+Genera entradas sintéticas del tamaño pedido, mide en el mismo proceso las
+funciones de cada programa con ``time.perf_counter`` (con calentamiento y
+repeticiones), registra la memoria pico con ``tracemalloc`` y compara contra
+una línea base en JSON, marcando como regresión cualquier caso que supere
+el umbral. La comparación usa el tiempo mínimo de las repeticiones, el menos
+afectado por el ruido del sistema, y exige además una diferencia absoluta
+mínima para que los casos de microsegundos no den falsas alarmas.
+
+Cada ``prepare_*`` retorna la función a medir o un par (preparación,
+función): la preparación se ejecuta antes de cada corrida, fuera del tiempo
+medido, para que los casos que escriben datos partan siempre del mismo
+estado. Los casos que arman toda la entrada en memoria (incluidos
+``process_file`` y ``load_words``, que retornan listas con todo el archivo)
+tienen un tamaño máximo en ``CASES``; solo el Tokenizer lee por bloques.
+
+Uso:
+    python benchmarks/run_benchmarks.py --sizes 1e3,1e5
+    python benchmarks/run_benchmarks.py --save-baseline
+    python benchmarks/run_benchmarks.py --only word_count --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import itertools
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BASELINE = os.path.join(REPO_ROOT, "benchmarks", "baseline.json")
+MIN_DIFFERENCE_S = 0.005
+
+
+def load_module(relative_path, name):
+    """Importa un programa del repositorio a partir de su ruta."""
+    path = os.path.join(REPO_ROOT, relative_path)
+    directory = os.path.dirname(path)
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def _write_lines(path, values):
+    """Escribe un valor por línea."""
+    with open(path, 'w', encoding='utf-8', buffering=1 << 20) as file:
+        for value in values:
+            file.write(f"{value}\n")
+
+
+def _vocabulary(rng, size):
+    """Genera ``size`` palabras pseudoaleatorias."""
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 10)))
+            for _ in range(size)]
+
+
+def prepare_statistics(size, rng, _workdir):
+    """compute_statistics sobre ``size`` números reales."""
+    module = load_module("A01733438_A4.2/P1/source/compute_statistics.py",
+                         "compute_statistics")
+    numbers = [rng.uniform(-1000, 1000) for _ in range(size)]
+    return lambda: module.compute_statistics(numbers)
+
+
+def prepare_convert(size, rng, workdir):
+    """convert_numbers.process_file sobre ``size`` enteros."""
+    module = load_module("A01733438_A4.2/P2/source/convert_numbers.py",
+                         "convert_numbers")
+    path = os.path.join(workdir, "convert.txt")
+    _write_lines(path, (rng.randint(-10**6, 10**6) for _ in range(size)))
+    return lambda: module.process_file(path)
+
+
+def prepare_word_count(size, rng, workdir):
+    """load_words + compute_frequencies sobre ``size`` palabras."""
+    module = load_module("A01733438_A4.2/P3/source/word_count.py",
+                         "word_count")
+    vocabulary = _vocabulary(rng, min(size, 50000))
+    path = os.path.join(workdir, "words.txt")
+    _write_lines(path, (rng.choice(vocabulary) for _ in range(size)))
+
+    def run():
+        return module.compute_frequencies(module.load_words(path))
+    return run
+
+
+def _tc5_file(size, workdir):
+    """Repite las palabras de P3/tests/TC5.txt hasta tener ``size``."""
+    with open(os.path.join(REPO_ROOT, "A01733438_A4.2/P3/tests/TC5.txt"),
+              'r', encoding='utf-8') as file:
+        words = file.read().split()
+    path = os.path.join(workdir, f"tc5-{size}.txt")
+    repeats, extra = divmod(size, len(words))
+    _write_lines(path, itertools.chain(
+        itertools.chain.from_iterable(itertools.repeat(words, repeats)),
+        words[:extra]))
+    return path
+
+
+def prepare_word_count_tc5(size, _rng, workdir):
+    """Ruta actual (load_words + compute_frequencies) sobre TC5."""
+    module = load_module("A01733438_A4.2/P3/source/word_count.py",
+                         "word_count")
+    path = _tc5_file(size, workdir)
+
+    def run():
+        return module.compute_frequencies(module.load_words(path))
+    return run
+
+
+def _prepare_tokenizer(size, workdir, ngram):
+    """
+    Tubería de normalización (--normalize) sobre TC5. Cada corrida parte
+    con la tabla de puntuación vacía y arma su Tokenizer, como una
+    ejecución nueva del programa.
+    """
+    module = load_module("A01733438_A4.2/P3/source/word_count.py",
+                         "word_count")
+    path = _tc5_file(size, workdir)
+
+    def run():
+        tokenizer = module.Tokenizer(module.Tokenizer.DEFAULT_STEPS,
+                                     ngram=ngram)
+        return tokenizer.count(path)
+    return module.punctuation_table().clear, run
+
+
+def prepare_word_count_tc5_pipeline(size, _rng, workdir):
+    """Tokenizer con NFKC, casefold y puntuación sobre TC5."""
+    return _prepare_tokenizer(size, workdir, 1)
+
+
+def prepare_word_count_tc5_bigrams(size, _rng, workdir):
+    """Tokenizer contando bigramas sobre TC5."""
+    return _prepare_tokenizer(size, workdir, 2)
+
+
+def prepare_sales(size, rng, _workdir):
+    """calculate_total sobre ``size`` ventas (5% inválidas)."""
+    module = load_module("A01733438_A5.2/compute_sales.py", "compute_sales")
+    catalogue = [{"title": f"P{number}", "price": rng.uniform(1, 500)}
+                 for number in range(1000)]
+    sales = []
+    for _ in range(size):
+        if rng.random() < 0.05:
+            sales.append({"product": "Desconocido", "quantity": 1})
+        else:
+            sales.append({"product": f"P{rng.randrange(1000)}",
+                          "quantity": rng.randint(1, 10)})
+    return lambda: module.calculate_total(catalogue, sales)
+
+
+def _reservation_files(workdir, size):
+    """Crea hoteles y clientes para los casos de reservaciones."""
+    module = load_module("A01733438_A6.2/reservation_system.py",
+                         "reservation_system")
+    files = [os.path.join(workdir, f"{name}-{size}.json")
+             for name in ("hotels", "customers", "reservations")]
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.Hotel.create_many(
+            [module.Hotel(f"H{number}", "Hotel", f"L{number % 10}", size)
+             for number in range(100)], files[0])
+        module.Customer.create_many(
+            [module.Customer(f"C{number}", "Cliente", "c@ejemplo.com")
+             for number in range(1000)], files[1])
+    return module, files
+
+
+def prepare_book_many(size, _rng, workdir):
+    """ReservationService.book_many de ``size`` reservas en un lote."""
+    module, files = _reservation_files(workdir, size)
+    batch = [module.Reservation(f"R{number}", f"C{number % 1000}",
+                                f"H{number % 100}", "2030-01-01",
+                                "2030-01-03")
+             for number in range(size)]
+
+    def setup():
+        for path in (files[2], files[2] + ".journal"):
+            if os.path.exists(path):
+                os.remove(path)
+
+    def run():
+        service = module.ReservationService(*files)
+        return service.book_many(batch)
+    return setup, run
+
+
+def prepare_lookups(size, rng, workdir):
+    """``size`` consultas por ID e índice secundario sobre reservaciones."""
+    module, files = _reservation_files(workdir, size)
+    with contextlib.redirect_stdout(io.StringIO()):
+        module.Reservation.create_many(
+            [module.Reservation(f"R{number}", f"C{number % 1000}",
+                                f"H{number % 100}")
+             for number in range(size)], files[2])
+    storage = sys.modules["storage"]
+    table = storage.open_table(files[2], module.Reservation.KEY,
+                               module.Reservation.INDEXES)
+    keys = [(f"R{rng.randrange(size)}", f"C{rng.randrange(1000)}")
+            for _ in range(size)]
+
+    def run():
+        for reservation_id, customer_id in keys:
+            table.get(reservation_id)
+            table.find("customer_id", customer_id)
+    return run
+
+
+CASES = {
+    "compute_statistics": (prepare_statistics, 10**7),
+    "convert_numbers": (prepare_convert, 10**7),
+    "word_count": (prepare_word_count, 10**7),
+    "word_count_tc5": (prepare_word_count_tc5, 10**7),
+    "word_count_tc5_pipeline": (prepare_word_count_tc5_pipeline, None),
+    "word_count_tc5_bigrams": (prepare_word_count_tc5_bigrams, None),
+    "compute_sales": (prepare_sales, 10**7),
+    "reservation_book_many": (prepare_book_many, 10**5),
+    "reservation_lookups": (prepare_lookups, 10**5),
+}
+
+
+def measure(function, warmup, repeat, setup=None):
+    """
+    Retorna (tiempos en segundos, memoria pico en KiB). Si hay ``setup``,
+    se llama antes de cada corrida, fuera de la medición.
+    """
+    setup = setup or (lambda: None)
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(warmup):
+            setup()
+            function()
+        timings = []
+        for _ in range(repeat):
+            setup()
+            started = time.perf_counter()
+            function()
+            timings.append(time.perf_counter() - started)
+        setup()
+        tracemalloc.start()
+        try:
+            function()
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    return timings, peak / 1024
+
+
+def run_suite(sizes, names, warmup=1, repeat=5, seed=1234):
+    """Ejecuta los casos y retorna {caso: {tamaño: métricas}}."""
+    results = {}
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in names:
+            prepare, max_size = CASES[name]
+            for size in sizes:
+                if max_size is not None and size > max_size:
+                    continue
+                with contextlib.redirect_stdout(io.StringIO()):
+                    prepared = prepare(size, random.Random(seed), workdir)
+                setup, function = (prepared if isinstance(prepared, tuple)
+                                   else (None, prepared))
+                timings, peak_kib = measure(function, warmup, repeat, setup)
+                metrics = {
+                    "median_s": statistics.median(timings),
+                    "min_s": min(timings),
+                    "peak_kib": round(peak_kib, 1),
+                }
+                results.setdefault(name, {})[str(size)] = metrics
+                print(f"{name:<24} n={size:<10} "
+                      f"mediana={metrics['median_s']:.6f}s "
+                      f"min={metrics['min_s']:.6f}s "
+                      f"pico={metrics['peak_kib']:.1f} KiB")
+    return results
+
+
+def compare(results, baseline, threshold, min_difference=MIN_DIFFERENCE_S):
+    """
+    Lista de regresiones (caso, tamaño, actual, base): casos cuyo tiempo
+    mínimo supera al de la base en más de ``threshold`` (relativo) y de
+    ``min_difference`` segundos.
+    """
+    regressions = []
+    for name, by_size in results.items():
+        for size, metrics in by_size.items():
+            reference = baseline.get(name, {}).get(size)
+            if reference is None:
+                continue
+            current, base = metrics["min_s"], reference["min_s"]
+            if (current > base * (1 + threshold)
+                    and current - base >= min_difference):
+                regressions.append((name, size, current, base))
+    return regressions
+
+
+def _parse_sizes(text):
+    """Convierte "1e3,10000" en [1000, 10000]."""
+    return [int(float(part)) for part in text.split(",") if part]
+
+
+def main():
+    """Función principal de la suite de benchmarks."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", type=_parse_sizes, default="1e3,1e4,1e5",
+                        help="tamaños separados por comas (1e3 a 1e8)")
+    parser.add_argument("--only", action="append", choices=sorted(CASES),
+                        help="ejecuta solo este caso (repetible)")
+    parser.add_argument("--warmup", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="regresión relativa tolerada (0.10 = 10%%)")
+    parser.add_argument("--min-diff", type=float, default=MIN_DIFFERENCE_S,
+                        help="diferencia absoluta mínima en segundos para "
+                             "marcar una regresión")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="guarda los resultados como nueva línea base")
+    args = parser.parse_args()
+
+    results = run_suite(args.sizes, args.only or list(CASES),
+                        args.warmup, args.repeat)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as file:
+                baseline = json.load(file)
+        for name, by_size in results.items():
+            baseline.setdefault(name, {}).update(by_size)
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(baseline, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Línea base guardada en: {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print("Advertencia: No hay línea base; use --save-baseline.")
+        return 0
+    with open(args.baseline, 'r', encoding='utf-8') as file:
+        baseline = json.load(file)
+    regressions = compare(results, baseline, args.threshold, args.min_diff)
+    for name, size, current, reference in regressions:
+        print(f"REGRESIÓN: {name} n={size}: min {current:.6f}s "
+              f"(base {reference:.6f}s, +{current / reference - 1:.0%})")
+    if not regressions:
+        print("Sin regresiones respecto a la línea base.")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,123 @@
+"""
+Instrumentación ligera para los programas de línea de comandos.
+
+Registra el tiempo de cada fase (lectura, cálculo, salida) y contadores
+como renglones leídos, renglones rechazados y bytes leídos. Todos los
+programas usan la misma definición: ``rows_parsed`` es el número de
+renglones (o registros) leídos de la entrada, incluidos los rechazados y
+los vacíos, y ``rows_rejected`` cuántos de ellos se descartaron. Con la
+bandera ``--profile`` también captura un perfil de ``cProfile`` y la
+memoria pico de ``tracemalloc``. Al terminar, ``Metrics.write`` deja un
+JSON de métricas junto al archivo de resultados (``StatisticsResults.txt``
+-> ``StatisticsResults.metrics.json``).
+"""
+
+import cProfile
+import json
+import os
+import pstats
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+PROFILE_FLAG = "--profile"
+TOP_FUNCTIONS = 20
+
+
+def pop_flag(args, flag):
+    """Quita ``flag`` de la lista ``args``; retorna si estaba presente."""
+    if flag in args:
+        args.remove(flag)
+        return True
+    return False
+
+
+class Metrics:
+    """Tiempos por fase y contadores de una ejecución."""
+
+    def __init__(self, program, profile=False):
+        """Inicia el reloj y, si ``profile``, cProfile y tracemalloc."""
+        self.program = program
+        self.phases = {}
+        self.counters = {}
+        self.profile = profile
+        self._started = time.perf_counter()
+        self._profiler = None
+        if profile:
+            tracemalloc.start()
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    @classmethod
+    def from_args(cls, program, args):
+        """Crea las métricas quitando ``--profile`` de ``args`` si aparece."""
+        return cls(program, pop_flag(args, PROFILE_FLAG))
+
+    @contextmanager
+    def phase(self, name):
+        """Acumula el tiempo del bloque en la fase ``name``."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[name] = (self.phases.get(name, 0.0)
+                                 + time.perf_counter() - started)
+
+    def count(self, name, amount=1):
+        """Suma ``amount`` al contador ``name``."""
+        self.counters[name] = self.counters.get(name, 0) + amount
+
+    def count_bytes(self, filename):
+        """Suma el tamaño de ``filename`` al contador ``bytes_read``."""
+        self.count("bytes_read", os.path.getsize(filename))
+
+    def elapsed(self):
+        """Segundos transcurridos desde que se crearon las métricas."""
+        return time.perf_counter() - self._started
+
+    def _stop_profile(self, stem):
+        """Detiene el perfil, guarda ``stem.prof`` y retorna el resumen."""
+        self._profiler.disable()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        profile_file = stem + ".prof"
+        self._profiler.dump_stats(profile_file)
+        stats = pstats.Stats(self._profiler)
+        ranking = sorted(stats.stats.items(),
+                         key=lambda item: item[1][3], reverse=True)
+        top = []
+        for (path, line, function), entry in ranking[:TOP_FUNCTIONS]:
+            top.append({
+                "function": f"{os.path.basename(path)}:{line}({function})",
+                "calls": entry[1],
+                "total_s": round(entry[2], 6),
+                "cumulative_s": round(entry[3], 6),
+            })
+        self._profiler = None
+        return {
+            "peak_memory_kib": round(peak / 1024, 1),
+            "profile_file": profile_file,
+            "top_functions": top,
+        }
+
+    def write(self, results_file):
+        """Escribe las métricas junto a ``results_file``; retorna la ruta."""
+        stem = os.path.splitext(results_file)[0]
+        report = {
+            "program": self.program,
+            "elapsed_s": round(self.elapsed(), 6),
+            "phases_s": {name: round(seconds, 6)
+                         for name, seconds in self.phases.items()},
+            "counters": self.counters,
+        }
+        if self._profiler is not None:
+            report["profile"] = self._stop_profile(stem)
+        metrics_file = stem + ".metrics.json"
+        try:
+            with open(metrics_file, 'w', encoding='utf-8') as file:
+                json.dump(report, file, indent=2, ensure_ascii=False)
+                file.write("\n")
+        except IOError as error:
+            print(f"Error al escribir las métricas: {error}")
+            return None
+        return metrics_file
@@ -0,0 +1,115 @@
+"""
+Escritura en flujo de reportes grandes.
+
+``ReportWriter`` formatea los renglones conforme se consumen y los escribe
+por bloques a un archivo con búfer grande, sin armar el reporte completo en
+memoria. La pantalla recibe los mismos renglones, solo los primeros N
+(``--head N``) o nada (``--quiet``). El archivo recibe siempre el reporte
+completo, con los mismos bytes que antes.
+"""
+
+import itertools
+import sys
+
+QUIET_FLAG = "--quiet"
+HEAD_FLAG = "--head"
+
+
+def pop_console_options(args):
+    """
+    Quita ``--quiet`` y ``--head N`` de la lista ``args``. Retorna
+    (quiet, head), con ``head`` en None si no se pidió.
+    """
+    quiet = QUIET_FLAG in args
+    if quiet:
+        args.remove(QUIET_FLAG)
+    head = None
+    if HEAD_FLAG in args:
+        position = args.index(HEAD_FLAG)
+        value = args[position + 1] if position + 1 < len(args) else ""
+        del args[position:position + 2]
+        if value.isdigit():
+            head = int(value)
+        else:
+            print(f"Advertencia: {HEAD_FLAG} requiere un entero; se ignora.")
+    return quiet, head
+
+
+class ReportWriter:
+    """Escribe un reporte renglón por renglón a archivo y pantalla."""
+
+    BUFFER_SIZE = 1 << 20
+    CHUNK_LINES = 4096
+
+    def __init__(self, filename, quiet=False, head=None, console=None):
+        """Abre ``filename`` para escritura con un búfer de 1 MiB."""
+        self.filename = filename
+        self.quiet = quiet
+        self.head = head
+        self.bytes_written = 0
+        self._console = console or sys.stdout
+        self._shown = 0
+        self._hidden = 0
+        # pylint: disable-next=consider-using-with
+        self._file = open(filename, 'w', encoding='utf-8',
+                          buffering=self.BUFFER_SIZE)
+
+    def __enter__(self):
+        """Permite usar el escritor con ``with``."""
+        return self
+
+    def __exit__(self, *exc_info):
+        """Cierra el archivo al salir del bloque."""
+        self.close()
+
+    def _emit(self, text):
+        """Escribe un bloque de texto en el archivo."""
+        self._file.write(text)
+        self.bytes_written += len(text.encode('utf-8'))
+
+    def line(self, text=""):
+        """Escribe un renglón fijo (encabezado o pie) en archivo y pantalla."""
+        self._flush_hidden()
+        self._emit(text + "\n")
+        if not self.quiet:
+            self._console.write(text + "\n")
+
+    def rows(self, template, items):
+        """
+        Escribe un renglón por elemento de ``items`` (tuplas) con
+        ``template.format(*item)``, formateando por bloques.
+        """
+        formatted = itertools.starmap(template.format, items)
+        while True:
+            chunk = list(itertools.islice(formatted, self.CHUNK_LINES))
+            if not chunk:
+                break
+            text = "\n".join(chunk) + "\n"
+            self._emit(text)
+            self._show(chunk, text)
+
+    def _show(self, chunk, text):
+        """Envía a la pantalla la parte del bloque que corresponde."""
+        if self.quiet:
+            return
+        if self.head is None:
+            self._console.write(text)
+            return
+        visible = chunk[:max(self.head - self._shown, 0)]
+        if visible:
+            self._console.write("\n".join(visible) + "\n")
+        self._shown += len(visible)
+        self._hidden += len(chunk) - len(visible)
+
+    def _flush_hidden(self):
+        """Avisa en pantalla cuántos renglones se omitieron por ``--head``."""
+        if self._hidden:
+            self._console.write(f"... {self._hidden} renglones más en "
+                                f"{self.filename}\n")
+            self._hidden = 0
+
+    def close(self):
+        """Vacía el búfer y cierra el archivo."""
+        if not self._file.closed:
+            self._flush_hidden()
+            self._file.close()
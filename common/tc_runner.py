@@ -0,0 +1,298 @@
+"""
+Ejecutor de casos de prueba (TC*.txt) compartido por los tester.py.
+
+En lugar de lanzar ``python programa.py TCn.txt`` uno por uno, importa el
+programa en procesos trabajadores y ejecuta su ``main()`` para cada caso en
+paralelo, cada uno en un directorio temporal propio. La salida de cada caso
+se compara con su archivo dorado (``golden/TCn.txt``) tras enmascarar los
+tiempos de ejecución, y se reporta el tiempo de cada caso.
+
+Los casos que ya pasaron y cuyo archivo de entrada, programa, módulos de
+``common`` y archivo dorado no cambiaron (mismo hash SHA-256) se omiten
+usando la caché ``.tc_cache.json``.
+
+Opciones de los tester.py:
+    --update-golden  regenera los archivos dorados con la salida actual
+    --force          ignora la caché
+    --workers N      número de procesos (por defecto, los CPU disponibles)
+    -v               muestra la salida en pantalla de cada caso
+"""
+
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+COMMON_DIR = os.path.dirname(os.path.abspath(__file__))
+GOLDEN_DIR = "golden"
+CACHE_FILE = ".tc_cache.json"
+TIMING_PATTERN = re.compile(
+    r"^((?:Tiempo de ejecución|Execution Time): )[0-9.]+", re.MULTILINE)
+
+_MODULES = {}
+
+
+def normalize(text):
+    """Enmascara los tiempos de ejecución para poder comparar salidas."""
+    return TIMING_PATTERN.sub(r"\1<tiempo>", text)
+
+
+def _load_program(source_path):
+    """Importa el programa una sola vez por proceso trabajador."""
+    module = _MODULES.get(source_path)
+    if module is None:
+        name = os.path.splitext(os.path.basename(source_path))[0]
+        spec = importlib.util.spec_from_file_location(name, source_path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _MODULES[source_path] = module
+    return module
+
+
+def _stage_case(case_path, workdir):
+    """Enlaza (o copia) el caso en ``workdir``; retorna su nombre simple."""
+    # El programa recibe el nombre simple del caso, como en el tester
+    # original, para que el reporte no incluya rutas absolutas.
+    case_name = os.path.basename(case_path)
+    try:
+        os.symlink(case_path, os.path.join(workdir, case_name))
+    except OSError:
+        shutil.copyfile(case_path, os.path.join(workdir, case_name))
+    return case_name
+
+
+def _read_text(path):
+    """Contenido de ``path`` o None si no existe."""
+    if not os.path.exists(path):
+        return None
+    with open(path, 'r', encoding='utf-8') as file:
+        return file.read()
+
+
+def run_case(source_path, result_file, case_path):
+    """
+    Ejecuta ``main()`` del programa con ``case_path`` en un directorio
+    temporal. Retorna (salida en pantalla, contenido del archivo de
+    resultados o None, segundos, error o None).
+    """
+    module = _load_program(source_path)
+    stdout = io.StringIO()
+    previous_dir, previous_argv = os.getcwd(), sys.argv
+    error = None
+    with tempfile.TemporaryDirectory() as workdir:
+        sys.argv = [source_path, _stage_case(case_path, workdir)]
+        os.chdir(workdir)
+        started = time.perf_counter()
+        try:
+            with contextlib.redirect_stdout(stdout):
+                module.main()
+        except Exception as exc:  # pylint: disable=broad-exception-caught
+            error = f"{type(exc).__name__}: {exc}"
+        seconds = time.perf_counter() - started
+        sys.argv = previous_argv
+        os.chdir(previous_dir)
+        output = _read_text(os.path.join(workdir, result_file))
+    return stdout.getvalue(), output, seconds, error
+
+
+def _digest(*paths):
+    """Hash SHA-256 del contenido de los archivos (ausentes cuentan vacío)."""
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                digest.update(file.read())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _common_sources():
+    """Módulos de ``common`` que importan los programas (ordenados)."""
+    return sorted(os.path.join(COMMON_DIR, name)
+                  for name in os.listdir(COMMON_DIR) if name.endswith(".py"))
+
+
+def _load_cache(path):
+    """Lee la caché de casos aprobados."""
+    try:
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def _save_cache(path, cache):
+    """Guarda la caché de casos aprobados."""
+    with open(path, 'w', encoding='utf-8') as file:
+        json.dump(cache, file, ensure_ascii=False)
+
+
+def _parse_options(argv):
+    """Interpreta las opciones de la línea de comandos."""
+    options = {"update_golden": False, "force": False, "workers": None,
+               "verbose": False}
+    args = list(argv)
+    while args:
+        arg = args.pop(0)
+        if arg == "--update-golden":
+            options["update_golden"] = True
+        elif arg == "--force":
+            options["force"] = True
+        elif arg == "-v":
+            options["verbose"] = True
+        elif arg == "--workers" and args and args[0].isdigit():
+            options["workers"] = int(args.pop(0))
+        else:
+            print(f"Advertencia: Opción desconocida ignorada: {arg}")
+    return options
+
+
+class _Suite:
+    """Rutas y opciones de una ejecución de ``run_suite``."""
+
+    def __init__(self, tests_dir, source_script, result_file, options):
+        self.tests_dir = tests_dir
+        self.result_file = result_file
+        self.options = options
+        self.source_path = os.path.abspath(
+            os.path.join(tests_dir, "..", "source", source_script))
+        self.results_dir = os.path.join(tests_dir, "..", "results")
+        self.golden_dir = os.path.join(tests_dir, GOLDEN_DIR)
+        self.program = None
+
+    def test_cases(self):
+        """Nombres de los TC*.txt, en orden numérico."""
+        return sorted((name for name in os.listdir(self.tests_dir)
+                       if name.startswith('TC') and name.endswith('.txt')),
+                      key=lambda name: (len(name), name))
+
+    def case_hash(self, case):
+        """Hash del caso, del programa, de ``common`` y del dorado."""
+        if self.program is None:
+            self.program = [self.source_path] + _common_sources()
+        return _digest(os.path.join(self.tests_dir, case), *self.program,
+                       os.path.join(self.golden_dir, case))
+
+    def run_pending(self, pending):
+        """Ejecuta en paralelo los casos pendientes; retorna sus resultados."""
+        if not pending:
+            return {}
+        workers = min(self.options["workers"] or os.cpu_count() or 1,
+                      len(pending))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                case: executor.submit(
+                    run_case, self.source_path, self.result_file,
+                    os.path.abspath(os.path.join(self.tests_dir, case)))
+                for case in pending}
+            return {case: future.result()
+                    for case, future in futures.items()}
+
+    def check(self, case, output, error):
+        """Compara (o regenera) el dorado del caso; retorna el estado."""
+        golden_path = os.path.join(self.golden_dir, case)
+        if error is not None or output is None:
+            return f"ERROR: {error or 'sin archivo de salida'}"
+        if self.options["update_golden"] or not os.path.exists(golden_path):
+            with open(golden_path, 'w', encoding='utf-8') as file:
+                file.write(normalize(output))
+            return "DORADO ACTUALIZADO"
+        expected = _read_text(golden_path)
+        return "OK" if normalize(output) == expected else "DIFERENTE"
+
+    def consolidate(self, consolidated):
+        """Escribe las salidas aprobadas en ``../results/result_file``."""
+        if not consolidated:
+            return
+        destination = os.path.join(self.results_dir, self.result_file)
+        with open(destination, 'w', encoding='utf-8') as file:
+            file.write("".join(consolidated))
+        print(f"\nArchivo de resultados consolidado en: "
+              f"{os.path.normpath(destination)}")
+
+
+def _report(suite, test_cases, outcomes, cache):
+    """
+    Imprime el estado de cada caso, actualiza la caché y retorna
+    (salidas aprobadas en orden, número de casos fallidos).
+    """
+    failures = 0
+    consolidated = []
+    for case in test_cases:
+        if case not in outcomes:
+            consolidated.append(cache[case]["output"])
+            print(f"{case:<10} {'OMITIDO (sin cambios)':<24}")
+            continue
+        stdout, output, seconds, error = outcomes[case]
+        if suite.options["verbose"]:
+            print(stdout)
+        status = suite.check(case, output, error)
+        if status in ("OK", "DORADO ACTUALIZADO"):
+            # El hash se calcula después de regenerar el dorado.
+            cache[case] = {"hash": suite.case_hash(case), "output": output}
+            consolidated.append(output)
+        else:
+            failures += 1
+            cache.pop(case, None)
+        print(f"{case:<10} {status:<24} {seconds:>10.6f} s")
+    return consolidated, failures
+
+
+def run_suite(tests_dir, source_script, result_file, argv=()):
+    """
+    Ejecuta los TC*.txt de ``tests_dir`` contra ``../source/source_script``
+    y consolida las salidas en ``../results/result_file``. Retorna el
+    número de casos fallidos.
+    """
+    suite = _Suite(tests_dir, source_script, result_file,
+                   _parse_options(argv))
+    if not os.path.exists(suite.source_path):
+        print(f"Error: No se encontró el script de origen en "
+              f"{suite.source_path}")
+        return 1
+
+    test_cases = suite.test_cases()
+    if not test_cases:
+        print("No se localizaron archivos de prueba con el prefijo 'TC'.")
+        return 1
+
+    os.makedirs(suite.results_dir, exist_ok=True)
+    os.makedirs(suite.golden_dir, exist_ok=True)
+    cache_path = os.path.join(tests_dir, CACHE_FILE)
+    cache = {} if suite.options["force"] else _load_cache(cache_path)
+    pending = [case for case in test_cases
+               if suite.options["update_golden"] or case not in cache
+               or cache[case]["hash"] != suite.case_hash(case)]
+
+    print("=" * 60)
+    print(f"EJECUCIÓN DE PRUEBAS: {source_script}")
+    print("=" * 60)
+
+    started = time.perf_counter()
+    outcomes = suite.run_pending(pending)
+    consolidated, failures = _report(suite, test_cases, outcomes, cache)
+    _save_cache(cache_path, cache)
+    suite.consolidate(consolidated)
+
+    print("-" * 60)
+    print(f"Casos: {len(test_cases)}, ejecutados: {len(pending)}, "
+          f"fallidos: {failures}, "
+          f"tiempo total: {time.perf_counter() - started:.3f} s")
+    print("=" * 60)
+    return failures
+
+
+def main(tester_file, source_script, result_file):
+    """Punto de entrada de los tester.py; termina con código de error."""
+    tests_dir = os.path.dirname(os.path.abspath(tester_file))
+    failures = run_suite(tests_dir, source_script, result_file,
+                         sys.argv[1:])
+    sys.exit(1 if failures else 0)